@@ -1,19 +1,65 @@
-import csv
-import seaborn as sns
-import matplotlib.pyplot as plt
-import pandas as pd
+from __future__ import annotations
 import os.path
 import json
+import hashlib
+import argparse
+import sys
+import time
+import traceback
+import importlib
+import logging
+import contextlib
+import sqlite3
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import functools
 from typing import Callable
-from matplotlib.ticker import FormatStrFormatter
 import copy
-import re
-import numpy as np
-import matplotlib as mpl
-from pydoc import locate
+
+class LazyModule:
+	"""Stands in for a module until one of its attributes is used, and only then imports it.
+	seaborn, matplotlib, pandas, and numpy take seconds to import, and none of them are needed to parse arguments or manage presets.
+	"""
+	def __init__(self, name: str, beforeImport: Callable[[], None] = None) -> None:
+		"""
+		Args:
+			name (str): The full name of the module
+			beforeImport (Callable[[], None], optional): Called right before the module is imported. Defaults to None.
+		"""
+		self.__dict__["name"] = name
+		self.__dict__["beforeImport"] = beforeImport
+		self.__dict__["module"] = None
+
+	def __getattr__(self, attribute: str):
+		if self.module == None:
+			if self.beforeImport != None:
+				self.beforeImport()
+			self.__dict__["module"] = importlib.import_module(self.name)
+		return getattr(self.module, attribute)
+
+def selectBackend() -> None:
+	"""Every figure is saved to a file, so unless the user has chosen a backend, the non-interactive Agg backend is used
+	"""
+	if "MPLBACKEND" not in os.environ:
+		importlib.import_module("matplotlib").use("Agg")
+
+sns = LazyModule("seaborn", selectBackend)
+plt = LazyModule("matplotlib.pyplot", selectBackend)
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+mpl = LazyModule("matplotlib")
+ticker = LazyModule("matplotlib.ticker")
+animation = LazyModule("matplotlib.animation", selectBackend)
+
+def locate(path: str):
+	"""Finds the object named path, like pydoc.locate, which it imports only when needed
+	"""
+	from pydoc import locate
+	return locate(path)
 
 #TODO: Change all ranges to np.arrange
-#TODO: Store data in pd.DataFrame instead of list
 
 def reduce(eval, base, combine, arr):
 	"""This is used to reduce an array to single value
@@ -101,6 +147,34 @@ AxisTypes = [
 	"gradient"
 ]
 
+"""Different ways the points of a Ramachandran plot can be drawn"""
+DensityModes = [
+	"points",
+	"hexbin",
+	"histogram"
+]
+
+"""Different ways line plots can be drawn"""
+LineBackends = [
+	"matplotlib",
+	"seaborn"
+]
+
+"""Picture formats that are drawn to pixels in memory, then encoded and written on a background thread. Any other format, such as pdf or svg, is saved by matplotlib directly"""
+PixelFormats = [
+	"png",
+	"webp",
+	"jpeg",
+	"jpg"
+]
+
+"""Different ways a moving average can be calculated"""
+MovingAverageTypes = [
+	"trailing",
+	"centered",
+	"exponential"
+]
+
 """Different settings related to each individual figure the user can change"""
 AxisValues = {
 	"name": Value("name", "What should the name of your preset be? ", "name [New Name]", "name ",
@@ -110,7 +184,7 @@ AxisValues = {
 	"type": Value("type", f"What type plot are you trying to make? {JoinLast(', ', AxisTypes, ', or ')} ", f"type [{'|'.join(AxisTypes)}]", "type ", 
 	    f"The type of plot you want to make with your data. The options are {JoinLast(', ', AxisTypes, ', and')}.", "Type: ", lambda t: t in AxisTypes, lambda t: t, "", True, False),
 	"numRows": Value("numRows", "How many rows are in the largest file? ", "numRows [Number of Rows]", "numRows ",
-		"The number of rows in the largest file you want to graph. This just helps speed up read-in of the files.", "Number of Rows: ", lambda numRows: numRows.isdigit(), lambda numRows: int(numRows), 0, True),
+		"The number of rows in the largest file you want to graph. This just helps speed up read-in of .dat files, which are read up to this row; .csv and .tsv files are always read to the end.", "Number of Rows: ", lambda numRows: numRows.isdigit(), lambda numRows: int(numRows), 0, True),
 	"numPlots": Value("numPlots", "How many datasets are you looking to plot? ", "numPlots [Number of Datasets]", "numPlots ",
 		"The number of sets of data you want to graph; the number of files you want to graph.", "Number of Plots: ", lambda numPlots: numPlots.isdigit(), lambda numPlots: int(numPlots), 0, True),
 	"xAxisTitle": Value("xAxisTitle", "What should the title of the X-Axis be? ", "xAxisTitle [Title]", "xAxisTitle ",
@@ -125,6 +199,16 @@ AxisValues = {
 		"The name of the dataset that will appear in the legend of this picture. Use \"[NAME]\" to insert the name of the original dataset or \"[NUM]\" to insert the number of frames into the name.", "Moving Average Name: ", lambda name: type(name) == str, lambda name: name, "[NAME] [NUM] Frame Mov. Avg.", True, restrictType=["line"]),
 	"onlyMovAvg": Value("onlyMovAvg", "Would you like to only display the moving average (as opposed to the actual data and the moving average)? (Y/N) ", "onlyMovAvg [Y | N]", "onlyMovAvg ",
 		"If, for example, your data is especially noisy, it may be clearer to only plot the moving average as opposed to both the data and the moving average.", "Only Moving Average: ", lambda x: x in ["Y", "N"], lambda x: x == "Y", "", False, True, restrictType=["line"]),
+	"movAvgType": Value("movAvgType", f"What type of moving average would you like? {JoinLast(', ', MovingAverageTypes, ', or ')} ", f"movAvgType [{'|'.join(MovingAverageTypes)}]", "movAvgType ",
+		"A trailing average uses the current frame and the frames before it, a centered average uses the frames on either side of the current frame, and an exponential average weights recent frames more heavily, with a span of movAvgFr frames.", "Moving Average Type: ", lambda t: t in MovingAverageTypes, lambda t: t, "trailing", False, True, restrictType=["line"]),
+	"downsample": Value("downsample", "How many points should each line be reduced to before it is drawn? Leave empty to draw every point. ", "downsample [Number of Points]", "downsample ",
+		"Lines with far more points than there are pixels in the picture are slow to draw. Each line is split into downsample/4 pieces, and only the first, last, lowest, and highest point of each piece is drawn, so peaks are never lost.", "Downsample: ", lambda d: d == "" or d.isdigit(), lambda d: 0 if d == "" else int(d), 0, False, True, restrictType=["line"]),
+	"lineBackend": Value("lineBackend", f"What should draw the lines? {JoinLast(', ', LineBackends, ', or ')} ", f"lineBackend [{'|'.join(LineBackends)}]", "lineBackend ",
+		"matplotlib draws each line directly from its data, which is much faster for large datasets. seaborn groups and aggregates the data before drawing it.", "Line Backend: ", lambda b: b in LineBackends, lambda b: b, "matplotlib", False, True, restrictType=["line"]),
+	"chunkRows": Value("chunkRows", "How many rows should be read at a time? Leave empty to read the whole file at once. ", "chunkRows [Number of Rows]", "chunkRows ",
+		"Files too large to fit in memory can be streamed: chunkRows rows are read at a time, and the moving average and downsampled line are calculated as they are read, so only the points that are drawn are kept. Only the first column is read, and downsample should be set too, otherwise every point is still kept.", "Chunk Rows: ", lambda c: c == "" or c.isdigit(), lambda c: 0 if c == "" else int(c), 0, False, True, restrictType=["line"]),
+	"readXLimit": Value("readXLimit", "Should only the rows inside xLimit be read? (Y/N) ", "readXLimit [Y | N]", "readXLimit ",
+		"Zooming in on part of a large file is faster when only the rows inside xLimit (and those their moving average needs) are read. Without a yLimit, the Y-Axis then fits only those rows, a downsampled line is picked from only those rows, and rows the X-Axis shows outside of xLimit, because of xTicks or a shared X-Axis, are left empty.", "Read X Limit: ", lambda x: x in ["Y", "N"], lambda x: x == "Y", False, False, True, ["line"]),
 	"palette": Value("palette", "Please enter the palette you would like to use, hex values separated only by a space. ", "palette [Hex Values separated by only a space]", "palette ", 
 		"Hex values determining the color of each dataset. If you are using a moving average, you should input 2*numPlots, in the order: [plot1] [mov avg plot1], etc", "Palette: ", lambda palette: palette == "" or reduce(lambda s: s[0] == "#" and len(s) == 7, True, lambda x, y: x and y, palette.split(" ")), lambda palette: palette.split(" "), [], False, restrictType=["line"], advancedOption=True),
 	"color": Value("color", "What are the colors/gradients are you using to color your scatter plots? You can add '_r' to reverse the order of the gradient. Separate each with a space. ", "color [New Color]", "color ", 
@@ -162,7 +246,13 @@ AxisValues = {
 	"endNs": Value("endNs", "When calculating a series of successive nanoseconds, what number do you want to end at (Exclusive)? ", "endNs [Nanosecond Number]", "endNs ", 
 		"This option allows you to plot the Ramachandran plot of multiple nanoseconds at once. What number do you want to end at?", "EndNS: ", lambda end: IsDigit(end), lambda end: int(end), 0, False, restrictType=["Ramachandran"]),
 	"indexOffset": Value("indexOffset", "Should there be any index offset? ", "indexOffset [Offset Value]", "indexOffset ", 
-		"When generating one plot after another, you can keep track of the current index. Should this be offset by any amount?", "Index Offset: ", lambda offset: offset.isdigit(), lambda offset: int(offset), 0, False, True, ["Ramachandran"])
+		"When generating one plot after another, you can keep track of the current index. Should this be offset by any amount?", "Index Offset: ", lambda offset: offset.isdigit(), lambda offset: int(offset), 0, False, True, ["Ramachandran"]),
+	"rasterize": Value("rasterize", "Should the points be saved as pixels, even in vector formats like PDF or SVG? (Y/N) ", "rasterize [Y | N]", "rasterize ",
+		"Saving hundreds of thousands of points as vector shapes makes pictures enormous and slow to save. Rasterizing draws the points as one image, while the axes and text stay sharp.", "Rasterize: ", lambda x: x in ["Y", "N"], lambda x: x == "Y", False, False, True, ["scatter", "Ramachandran"]),
+	"density": Value("density", f"How should the points be drawn? {JoinLast(', ', DensityModes, ', or ')} ", f"density [{'|'.join(DensityModes)}]", "density ",
+		"Instead of drawing every point, hexbin and histogram count how many points fall in each cell of a grid and color the cell by that count, so drawing takes the same time no matter how many points there are.", "Density: ", lambda x: x in DensityModes, lambda x: x, "points", False, True, ["Ramachandran"]),
+	"gridSize": Value("gridSize", "How many cells across should the hexbin or histogram grid be? ", "gridSize [Number of Cells]", "gridSize ",
+		"The number of cells along each axis when density is hexbin or histogram. If density is points, then this is ignored.", "Grid Size: ", lambda x: x.isdigit(), lambda x: int(x), 72, False, True, ["Ramachandran"])
 }
 
 """Different settings related to each individual figures the user can edit"""
@@ -184,7 +274,17 @@ FigureValues = {
 	"width": Value("width", "What should the width of the plot be? ", "width [Width]", "width ", 
 		"What should the width of the figure be?", "Width: ", lambda width: width.isdigit(), lambda width: int(width), 1, True, False),
 	"height": Value("height", "What should the height of the plot be? ", "height [Height]", "height ", 
-		"What should the height of the figure be?", "Height: ", lambda height: height.isdigit(), lambda height: int(height), 1, True, False)
+		"What should the height of the figure be?", "Height: ", lambda height: height.isdigit(), lambda height: int(height), 1, True, False),
+	"dpi": Value("dpi", "How many pixels per inch should pictures be saved with? ", "dpi [Dots per Inch]", "dpi ",
+		"The resolution pictures are saved with. Lower resolutions draw and encode much faster. Has no effect on the text or lines of vector formats like PDF or SVG.", "DPI: ", lambda dpi: dpi.isdigit() and int(dpi) > 0, lambda dpi: int(dpi), 500, False, True),
+	"format": Value("format", f"What format should pictures be saved in? {JoinLast(', ', PixelFormats[:3], ', or ')}, or leave empty to use the extension of the picture's name. ", f"format [{'|'.join(PixelFormats[:3])}]", "format ",
+		"Replaces the extension of the picture's name. PNG is lossless, WebP and JPEG are much smaller but lose some detail. Leave empty to choose the format from the extension, which can also be a vector format like pdf or svg.", "Format: ", lambda f: f == "" or f in PixelFormats, lambda f: f, "", False, True),
+	"compression": Value("compression", "How hard should PNG pictures be compressed, from 0 to 9? ", "compression [0-9]", "compression ",
+		"The zlib compression level of PNG pictures. Higher levels make smaller files but take longer to encode, 1 is several times faster than 9.", "Compression: ", lambda c: c.isdigit() and int(c) <= 9, lambda c: int(c), 6, False, True),
+	"quality": Value("quality", "What quality should WebP and JPEG pictures be saved with, from 1 to 100? Leave empty for the default. ", "quality [1-100]", "quality ",
+		"Higher qualities keep more detail, but make larger files. 0 uses the default of the format.", "Quality: ", lambda q: q == "" or (q.isdigit() and int(q) <= 100), lambda q: 0 if q == "" else int(q), 0, False, True),
+	"reuseBbox": Value("reuseBbox", "Should the area around the figure that is saved be calculated once and reused for every frame? (Y/N) ", "reuseBbox [Y | N]", "reuseBbox ",
+		"Finding the area of the figure that holds anything takes an extra pass over the figure for every picture. If only the points and numbers in titles change between frames, the area of the first frame can be reused for the rest.", "Reuse Bbox: ", lambda x: x in ["Y", "N"], lambda x: x == "Y", False, False, True)
 }
 
 """Different settings related to each individual subplots the user can edit"""
@@ -209,6 +309,709 @@ SubplotValues = {
 		"If bounds are not placed on the start and end value of the Y-Axis, this will set each sub-plot to have the same start, end, etc. values.", "ShareY: ", lambda x: x in ["Y", "N"], lambda x: True if x == "Y" else False, False, False)
 }
 
+class PresetSchema:
+	"""The Values of one type of preset, shared by every preset of that type.
+	The prompts, help, and functions of each Value are stored once here, and each preset only stores its own values, in the same order.
+	"""
+	def __init__(self, values: dict[str, Value]) -> None:
+		"""
+		Args:
+			values (dict[str, Value]): The Values of this type of preset, such as AxisValues. Their values are the defaults.
+		"""
+		self.fields = tuple(values.values())
+		self.names = tuple(values.keys())
+		self.index = {name: i for i, name in enumerate(self.names)}
+
+class BoundValue:
+	"""One Value of a preset. Its value is read from and written to the preset, and everything else is read from the Value in the schema.
+	"""
+	__slots__ = ("store", "slot")
+
+	def __init__(self, store: PresetValues, slot: int) -> None:
+		self.store = store
+		self.slot = slot
+
+	@property
+	def value(self) -> any:
+		return self.store.slots[self.slot]
+
+	@value.setter
+	def value(self, value: any) -> None:
+		self.store.slots[self.slot] = value
+
+	def __getattr__(self, attribute: str):
+		return getattr(self.store.schema.fields[self.slot], attribute)
+
+class PresetValues:
+	"""The values of one preset, stored in a list in the order of its schema.
+	Used like the dictionary of Values it replaces: values["name"].value reads or changes a value, and values.values() lists them all.
+	"""
+	__slots__ = ("schema", "slots")
+
+	def __init__(self, schema: PresetSchema, slots: list[any]) -> None:
+		"""
+		Args:
+			schema (PresetSchema): The schema of this type of preset
+			slots (list[any]): One value for each Value in the schema, in the same order
+		"""
+		self.schema = schema
+		self.slots = slots
+
+	def __getitem__(self, name: str) -> BoundValue:
+		return BoundValue(self, self.schema.index[name])
+
+	def __contains__(self, name: str) -> bool:
+		return name in self.schema.index
+
+	def __iter__(self):
+		return iter(self.schema.names)
+
+	def __len__(self) -> int:
+		return len(self.slots)
+
+	def keys(self) -> tuple[str]:
+		return self.schema.names
+
+	def values(self) -> list[BoundValue]:
+		return [BoundValue(self, i) for i in range(len(self.slots))]
+
+	def copy(self) -> PresetValues:
+		"""Returns a copy that can be changed without changing this one. Values are only ever replaced, never changed in place, so the list is copied but its values are shared.
+		"""
+		return PresetValues(self.schema, list(self.slots))
+
+"""The schemas of each type of preset"""
+AxisSchema = PresetSchema(AxisValues)
+FigureSchema = PresetSchema(FigureValues)
+SubplotSchema = PresetSchema(SubplotValues)
+
+def DataFileSeparator(path: str) -> str:
+	"""Returns the separator between the columns of a data file, based on its extension
+	"""
+	match path[len(path)-4:]:
+		case ".tsv":
+			return "\t"
+		case ".csv":
+			return ","
+		case ".dat":
+			return r"\s+"
+		case _:
+			raise ValueError("Data file must be in .csv, .tsv, or .dat format.")
+
+def DataFileColumns(path: str) -> int:
+	"""Returns the number of columns of values in a data file, not counting the row index, from its first row after the header
+	"""
+	try:
+		return pd.read_csv(path, sep=DataFileSeparator(path), header=None, skiprows=1, nrows=1, engine="c").shape[1] - 1
+	except pd.errors.EmptyDataError:
+		return 0
+
+def ReadDataFile(path: str, maxRows: int = 0, firstRow: int = 0, columns: tuple[int, int] = None) -> np.ndarray:
+	"""Reads a .tsv, .csv, or .dat file in bulk into a column-major 2-D float64 array, so each column is contiguous.
+
+	The first line of the file is treated as a header and the first column as the row index; neither is kept.
+	.dat files may be separated by any amount of whitespace, .csv files by commas, and .tsv files by tabs.
+	Rows before firstRow are skipped without being converted, and columns outside of columns are never converted at all.
+
+	Args:
+		path (str): The path to the data file
+		maxRows (int, optional): The row to stop reading before, 0 reads the whole file. Defaults to 0.
+		firstRow (int, optional): The first row to read. Defaults to 0.
+		columns (tuple[int, int], optional): The first and last (exclusive) column of values to read, not counting the row index. Defaults to None, which reads every column.
+
+	Returns:
+		np.ndarray: data[n][m] is the value of column m+1 (plus the first of columns) of the file on row n+1 (plus firstRow). 
+			When no rows are read, it still has as many columns as would have been read.
+	"""
+	empty = lambda: np.empty((0, columns[1] - columns[0] if columns else DataFileColumns(path)), order="F")
+	if maxRows and maxRows <= firstRow:
+		return empty()
+	try:
+		frame = pd.read_csv(path, sep=DataFileSeparator(path), header=None, skiprows=1 + firstRow, nrows=maxRows - firstRow if maxRows else None, 
+			usecols=range(columns[0] + 1, columns[1] + 1) if columns else None, dtype=np.float64, engine="c")
+	except pd.errors.EmptyDataError:
+		#firstRow is past the end of the file
+		return empty()
+	return np.asfortranarray(frame.to_numpy() if columns else frame.to_numpy()[:, 1:])
+
+def DownsampleIndices(data: np.ndarray, points: int) -> np.ndarray:
+	"""Picks at most points rows of data that still look the same when drawn as a line.
+	The rows are split into points/4 equal buckets, and the first, last, lowest, and highest row of each bucket is kept (the M4 algorithm), so no peak or trough is lost.
+
+	Args:
+		data (np.ndarray): A 1-D array of values, in the order they are drawn
+		points (int): The largest number of rows to keep
+
+	Returns:
+		np.ndarray: The sorted indices of the rows to keep. Every index is kept if there are no more than points rows.
+	"""
+	length = len(data)
+	buckets = points // 4
+	if length <= points or buckets < 1:
+		return np.arange(length)
+
+	size = -(-length // buckets)
+	#Pad the data so it divides evenly into buckets, NaNs are never chosen as a bucket's lowest or highest value
+	padded = np.full(buckets * size, np.nan)
+	padded[:length] = data
+	padded = padded.reshape(buckets, size)
+	starts = np.arange(buckets) * size
+	lowest = starts + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+	highest = starts + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+	last = np.minimum(starts + size - 1, length - 1)
+	indices = np.unique(np.concatenate((starts, lowest, highest, last)))
+	return indices[indices < length]
+
+def MovingAverage(data: np.ndarray, window: int, avgType: str = "trailing") -> np.ndarray:
+	"""Calculates the moving average of every column of data at once in O(n) time using a cumulative sum.
+
+	Args:
+		data (np.ndarray): A 1-D array, or a 2-D array with one column per series
+		window (int): The number of frames in the window, or the span of an exponential average
+		avgType (str, optional): One of MovingAverageTypes. Defaults to "trailing".
+
+	Returns:
+		np.ndarray: An array of the same shape as data. Frames without a full window are NaN, for example the first window-1 frames of a trailing average, 
+			as are those whose window contains a NaN.
+	"""
+	data = np.asarray(data, dtype=np.float64)
+	if avgType not in MovingAverageTypes:
+		raise ValueError(f"Moving average type must be {JoinLast(', ', MovingAverageTypes, ', or ')}.")
+	if avgType == "exponential":
+		return pd.DataFrame(data.reshape(len(data), int(np.prod(data.shape[1:])))).ewm(span=window, adjust=False).mean().to_numpy().reshape(data.shape)
+
+	result = np.full(data.shape, np.nan)
+	if window < 1 or window > len(data):
+		return result
+	#Missing values count as 0 in the sum, and the number of them in each window is counted, so only the windows that contain one are NaN
+	missing = np.isnan(data)
+	#Subtracting the first row keeps the cumulative sum small, so the differences between sums lose less precision
+	first = np.nan_to_num(data[0])
+	shifted = np.where(missing, 0, data - first)
+	zeros = np.zeros((1,) + data.shape[1:])
+	sums = np.concatenate((zeros, np.cumsum(shifted, axis=0)))
+	gaps = np.concatenate((zeros, np.cumsum(missing, axis=0)))
+	means = (sums[window:] - sums[:-window]) / window + first
+	means[gaps[window:] != gaps[:-window]] = np.nan
+	#means[k] is the average of frames k to k+window-1, a centered average places it in the middle of that window instead of at the end
+	start = window - 1 if avgType == "trailing" else window // 2
+	result[start:start + len(means)] = means
+	return result
+
+def FileFingerprint(path: str) -> list:
+	"""Returns the absolute path, size, and modification time of a file, which change whenever the file is edited
+	"""
+	stat = os.stat(path)
+	return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+def StreamDataFile(path: str, chunkRows: int, maxRows: int = 0, firstRow: int = 0):
+	"""Reads the first column of values of a data file chunkRows rows at a time, in the same format as ReadDataFile, so the whole file is never in memory
+
+	Args:
+		path (str): The path to the data file
+		chunkRows (int): The number of rows in each chunk
+		maxRows (int, optional): The row to stop reading before, 0 reads the whole file. Defaults to 0.
+		firstRow (int, optional): The first row to read. Defaults to 0.
+
+	Yields:
+		np.ndarray: The values of the next chunkRows rows, the last chunk may be shorter
+	"""
+	if maxRows and maxRows <= firstRow:
+		return
+	try:
+		reader = pd.read_csv(path, sep=DataFileSeparator(path), header=None, skiprows=1 + firstRow, nrows=maxRows - firstRow if maxRows else None, usecols=[1], 
+			dtype=np.float64, engine="c", chunksize=chunkRows)
+	except pd.errors.EmptyDataError:
+		return
+	with reader:
+		for chunk in reader:
+			yield chunk.to_numpy()[:, 0]
+
+class StreamingMovingAverage:
+	"""Calculates the same moving average as MovingAverage, one chunk of a 1-D series at a time, carrying only what the next chunk needs: 
+	the last window-1 values of a trailing or centered average, or the last value of an exponential one.
+	"""
+	def __init__(self, window: int, avgType: str = "trailing") -> None:
+		"""
+		Args:
+			window (int): The number of frames in the window, or the span of an exponential average
+			avgType (str, optional): One of MovingAverageTypes. Defaults to "trailing".
+		"""
+		if avgType not in MovingAverageTypes:
+			raise ValueError(f"Moving average type must be {JoinLast(', ', MovingAverageTypes, ', or ')}.")
+		self.window = window
+		self.avgType = avgType
+		self.carry = np.empty(0)
+		#A centered average of a frame is the trailing average of the frame shift frames later, so it lags shift frames behind the data
+		self.shift = window - 1 - window // 2 if avgType == "centered" else 0
+		self.skipped = 0
+
+	def Push(self, chunk: np.ndarray) -> np.ndarray:
+		"""Returns the average of every frame that can be calculated now that chunk has been read, continuing from the last frame returned
+		"""
+		if self.avgType == "exponential":
+			if len(self.carry):
+				#Starting from the previous average continues the recursion exactly where it stopped
+				means = MovingAverage(np.concatenate((self.carry, chunk)), self.window, "exponential")[1:]
+			else:
+				means = MovingAverage(chunk, self.window, "exponential")
+			self.carry = means[-1:] if len(means) else self.carry
+			return means
+
+		data = np.concatenate((self.carry, chunk))
+		means = MovingAverage(data, self.window, "trailing")[len(self.carry):]
+		self.carry = data[max(len(data) - (self.window - 1), 0):] if self.window > 1 else data[:0]
+		skip = min(self.shift - self.skipped, len(means))
+		self.skipped += skip
+		return means[skip:]
+
+	def Finish(self) -> np.ndarray:
+		"""Returns the frames at the end of a centered average, which never have a full window
+		"""
+		return np.full(self.skipped if self.avgType == "centered" else 0, np.nan)
+
+class StreamingDownsample:
+	"""Picks the rows of a 1-D series to draw, one chunk at a time, the same way DownsampleIndices does.
+	Since the number of rows isn't known in advance, the buckets start with one row each and pairs of neighboring buckets are merged whenever there are too many, 
+	which is exact because the first, last, lowest, and highest row of two buckets are found among those of each bucket.
+	Only one summary per bucket is kept, so at most about points rows are ever held at once.
+	"""
+	"""The columns of a bucket's summary: the row and value of its first, last, lowest, and highest row"""
+	FIRST, LAST, LOWEST, HIGHEST = 0, 2, 4, 6
+
+	def __init__(self, points: int) -> None:
+		"""
+		Args:
+			points (int): The largest number of rows to keep, 0 keeps every row
+		"""
+		#DownsampleIndices keeps every row when there would be less than one bucket
+		self.points = points if points >= 4 else 0
+		self.rows = 0
+		self.size = 1
+		self.buckets = np.empty((0, 8))
+		self.partial = None
+		self.partialRows = 0
+		self.kept = []
+
+	@staticmethod
+	def Summarize(values: np.ndarray, start: int, size: int) -> np.ndarray:
+		"""Returns the summary of each bucket of size rows in values, whose first row is row start of the series
+		"""
+		buckets = values.reshape(-1, size)
+		rows = np.arange(len(buckets))
+		starts = start + rows * size
+		lowest = np.argmin(np.where(np.isnan(buckets), np.inf, buckets), axis=1)
+		highest = np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1)
+		return np.column_stack((starts, buckets[:, 0], starts + size - 1, buckets[:, -1], starts + lowest, buckets[rows, lowest], starts + highest, buckets[rows, highest]))
+
+	@staticmethod
+	def Combine(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+		"""Returns the summary of each bucket in first merged with the bucket after it in second. Ties go to the earlier row, as with np.argmin and np.argmax.
+		"""
+		result = first.copy()
+		result[:, 2:4] = second[:, 2:4]
+		lower = np.where(np.isnan(second[:, 5]), np.inf, second[:, 5]) < np.where(np.isnan(first[:, 5]), np.inf, first[:, 5])
+		result[lower, 4:6] = second[lower, 4:6]
+		higher = np.where(np.isnan(second[:, 7]), -np.inf, second[:, 7]) > np.where(np.isnan(first[:, 7]), -np.inf, first[:, 7])
+		result[higher, 6:8] = second[higher, 6:8]
+		return result
+
+	def Grow(self) -> None:
+		"""Doubles the size of every bucket by merging each pair of neighboring buckets
+		"""
+		if len(self.buckets) % 2:
+			#The last bucket has no partner, so it becomes the start of the unfinished bucket, which still holds fewer rows than the new size
+			last = self.buckets[-1:]
+			self.partial = last if self.partial is None else self.Combine(last, self.partial)
+			self.partialRows += self.size
+			self.buckets = self.buckets[:-1]
+		self.buckets = self.Combine(self.buckets[0::2], self.buckets[1::2])
+		self.size *= 2
+
+	def Push(self, values: np.ndarray) -> None:
+		"""Adds the next rows of the series
+		"""
+		start = self.rows
+		self.rows += len(values)
+		if not self.points:
+			self.kept.append(values)
+			return
+		#Each bucket contributes up to four rows, so buckets are merged until this chunk fits
+		while (len(self.buckets) + (self.partialRows + len(values)) // self.size) * min(self.size, 4) > self.points:
+			self.Grow()
+
+		if self.partial is not None:
+			head = values[:self.size - self.partialRows]
+			if len(head):
+				self.partial = self.Combine(self.partial, self.Summarize(head, start, len(head)))
+			self.partialRows += len(head)
+			values, start = values[len(head):], start + len(head)
+			if self.partialRows == self.size:
+				self.buckets = np.concatenate((self.buckets, self.partial))
+				self.partial, self.partialRows = None, 0
+		full = len(values) // self.size * self.size
+		if full:
+			self.buckets = np.concatenate((self.buckets, self.Summarize(values[:full], start, self.size)))
+		if full < len(values):
+			self.partial = self.Summarize(values[full:], start + full, len(values) - full)
+			self.partialRows = len(values) - full
+
+	def Result(self) -> tuple[np.ndarray, np.ndarray]:
+		"""Returns the rows that were kept and their values, in order
+		"""
+		if not self.points:
+			return np.arange(self.rows), np.concatenate(self.kept) if self.kept else np.empty(0)
+		buckets = self.buckets if self.partial is None else np.concatenate((self.buckets, self.partial))
+		rows = buckets[:, [self.FIRST, self.LAST, self.LOWEST, self.HIGHEST]].ravel()
+		values = buckets[:, [self.FIRST + 1, self.LAST + 1, self.LOWEST + 1, self.HIGHEST + 1]].ravel()
+		rows, unique = np.unique(rows, return_index=True)
+		return rows.astype(np.int64), values[unique]
+
+class DataCache:
+	"""A directory of data files that have already been parsed, saved in NumPy's binary format so they can be loaded without parsing the text again.
+
+	Entries are keyed on the path, size, and modification time of the data file, along with the options used to read it, so editing a file or a preset's numRows never returns stale data.
+	When the directory grows larger than maxBytes, the least recently used entries are removed.
+	Entries are stored column-major, so when they are memory-mapped, reading one column only touches that column's pages on disk.
+	"""
+	"""Changing this invalidates every entry, bump it whenever ReadDataFile's output changes"""
+	version = 2
+
+	def __init__(self, directory: str = ".graph_cache", maxBytes: int = 2 * 1024**3, enabled: bool = True) -> None:
+		"""
+		Args:
+			directory (str, optional): Where the cached files are stored. Defaults to ".graph_cache".
+			maxBytes (int, optional): The largest the directory may grow before old entries are removed. Defaults to 2 GiB.
+			enabled (bool, optional): When False, nothing is read from or written to the cache. Defaults to True.
+		"""
+		self.directory = directory
+		self.maxBytes = maxBytes
+		self.enabled = enabled
+
+	def Key(self, path: str, *options) -> str:
+		"""Returns the name of the cache entry for path read with options
+		"""
+		description = "|".join(str(x) for x in [self.version, *FileFingerprint(path), *options])
+		return hashlib.sha1(description.encode()).hexdigest()
+
+	def Load(self, path: str, *options, mmap: bool = False) -> np.ndarray | None:
+		"""Returns the cached data for path read with options, or None if it has not been cached.
+		If mmap is True, the data is memory-mapped read-only instead of being read into memory.
+		"""
+		if not self.enabled:
+			return None
+		entry = os.path.join(self.directory, self.Key(path, *options) + ".npy")
+		try:
+			data = np.load(entry, mmap_mode="r" if mmap else None)
+		except (OSError, ValueError):
+			return None
+		#Touching the entry marks it as recently used
+		os.utime(entry)
+		return data
+
+	def Store(self, path: str, data: np.ndarray, *options) -> None:
+		"""Saves data as the cache entry for path read with options, then removes old entries if the cache is too large
+		"""
+		if not self.enabled:
+			return
+		os.makedirs(self.directory, exist_ok=True)
+		entry = os.path.join(self.directory, self.Key(path, *options) + ".npy")
+		#Writing to a temporary file first means no one ever loads a half-written entry
+		temp = f"{entry}.{os.getpid()}.tmp"
+		with open(temp, "wb") as file:
+			np.save(file, np.asfortranarray(data))
+		os.replace(temp, entry)
+		self.Evict()
+
+	def Evict(self) -> None:
+		"""Removes the least recently used entries until the cache is no larger than maxBytes
+		"""
+		entries = []
+		for x in os.scandir(self.directory):
+			if x.name.endswith(".npy"):
+				stat = x.stat()
+				entries.append((stat.st_mtime, stat.st_size, x.path))
+		total = sum(size for _, size, _ in entries)
+		for _, size, entry in sorted(entries):
+			if total <= self.maxBytes:
+				break
+			try:
+				os.remove(entry)
+			except FileNotFoundError:
+				pass
+			total -= size
+
+	def Clear(self) -> None:
+		"""Removes every entry in the cache
+		"""
+		if os.path.isdir(self.directory):
+			for x in os.scandir(self.directory):
+				if x.name.endswith(".npy") or x.name.endswith(".tmp"):
+					os.remove(x.path)
+
+"""The cache used when loading data, configured by the command line arguments"""
+dataCache = DataCache()
+
+class BuildManifest:
+	"""Records what every picture was rendered from, so pictures whose presets, titles, and data files haven't changed are skipped, like make does.
+
+	Each picture has its own entry, named after its path, holding the key it was rendered with along with the picture's size and modification time, 
+	so deleting or replacing a picture also makes it render again. Entries are written atomically, so processes rendering at the same time never corrupt each other's.
+	"""
+	"""Changing this invalidates every entry, bump it whenever the way figures are drawn changes"""
+	version = 1
+
+	def __init__(self, directory: str = ".graph_manifest", force: bool = False) -> None:
+		"""
+		Args:
+			directory (str, optional): Where the entries are stored. Defaults to ".graph_manifest".
+			force (bool, optional): When True, no picture is ever up to date, but every picture rendered is still recorded. Defaults to False.
+		"""
+		self.directory = directory
+		self.force = force
+
+	def Entry(self, output: str) -> str:
+		"""Returns the path of the entry for the picture at output
+		"""
+		return os.path.join(self.directory, hashlib.sha1(os.path.abspath(output).encode()).hexdigest() + ".json")
+
+	def IsCurrent(self, output: str, key: str) -> bool:
+		"""Returns whether the picture at output was rendered with key and hasn't changed since
+		"""
+		if self.force:
+			return False
+		try:
+			with open(self.Entry(output)) as file:
+				entry = json.load(file)
+			stat = os.stat(output)
+		except (OSError, ValueError):
+			return False
+		return entry == {"version": self.version, "key": key, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+	def Record(self, output: str, key: str) -> None:
+		"""Records that the picture at output was just rendered with key
+		"""
+		os.makedirs(self.directory, exist_ok=True)
+		stat = os.stat(output)
+		entry = self.Entry(output)
+		temp = f"{entry}.{os.getpid()}.tmp"
+		with open(temp, "w") as file:
+			json.dump({"version": self.version, "key": key, "size": stat.st_size, "mtime": stat.st_mtime_ns}, file)
+		os.replace(temp, entry)
+
+	def Clear(self) -> None:
+		"""Removes every entry, so every picture is rendered again
+		"""
+		if os.path.isdir(self.directory):
+			for x in os.scandir(self.directory):
+				if x.name.endswith(".json") or x.name.endswith(".tmp"):
+					os.remove(x.path)
+
+"""The manifest of rendered pictures, configured by the command line arguments"""
+buildManifest = BuildManifest()
+
+class ImageWriter:
+	"""Encodes pictures and writes them to disk on background threads, so the next frame can be drawn while the last one is still being compressed.
+	Pillow releases the GIL while it compresses, so encoding runs on another CPU alongside drawing.
+	"""
+	def __init__(self, threads: int = 2) -> None:
+		"""
+		Args:
+			threads (int, optional): The number of threads encoding pictures, 0 encodes each picture before the next is drawn. Defaults to 2.
+		"""
+		self.threads = threads
+		self.pool = None
+		self.pending = []
+		self.pid = None
+
+	def __getstate__(self) -> dict:
+		#Threads can't be sent to another process, it starts its own
+		return self.__dict__ | {"pool": None, "pending": [], "pid": None}
+
+	def Submit(self, function: Callable, *args) -> None:
+		"""Runs function(*args) on a background thread.
+		Each picture waiting to be encoded holds all of its pixels, so once twice as many as there are threads are waiting, this waits for the oldest first.
+		"""
+		if self.threads <= 0:
+			function(*args)
+			return
+		if self.pid != os.getpid():
+			#Threads don't survive fork, so a forked process starts its own, and has nothing of its parent's to wait for
+			self.pool = ThreadPoolExecutor(max_workers = self.threads, thread_name_prefix = "ImageWriter")
+			self.pending = []
+			self.pid = os.getpid()
+		while len(self.pending) >= 2 * self.threads:
+			self.pending.pop(0).result()
+		self.pending.append(self.pool.submit(function, *args))
+
+	def Wait(self) -> None:
+		"""Waits until every picture has been written, raising the first error any of them hit.
+		The threads are stopped too, so none are running if this process forks later.
+		"""
+		if self.pid != os.getpid():
+			return
+		pending, self.pending = self.pending, []
+		errors = [x.exception() for x in pending]
+		self.pool.shutdown()
+		self.pool = None
+		self.pid = None
+		for x in errors:
+			if x != None:
+				raise x
+
+"""Encodes and writes pictures in the background, configured by the command line arguments"""
+imageWriter = ImageWriter()
+
+"""Messages about what Graph.py is doing, shown according to --log-level"""
+log = logging.getLogger("Graph")
+
+def PeakMemory() -> float | None:
+	"""Returns the most memory this process has used so far, in MiB, or None if the platform can't tell
+	"""
+	try:
+		import resource
+	except ImportError:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	#Linux reports KiB, macOS reports bytes
+	return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+class Instrumentation:
+	"""Records how long each stage of drawing a figure takes, and how much memory it uses, for every dataset and frame, so slow stages can be found.
+
+	Each record holds the wall and CPU time of one stage, the peak resident memory of the process when the stage finished, and how much the stage raised that peak.
+	With traceMemory, the most memory Python had allocated at once during the stage is recorded as well, which needs tracemalloc to have been started.
+	While disabled, Stage returns a context manager that does nothing, so marking a stage costs almost nothing.
+	"""
+	"""The columns of a CSV report, in order"""
+	columns = ["stage", "dataset", "frame", "job", "pid", "wall", "cpu", "peakRssMiB", "rssGrowthMiB", "tracedPeakMiB"]
+
+	def __init__(self, enabled: bool = False, traceMemory: bool = False) -> None:
+		"""
+		Args:
+			enabled (bool, optional): Whether stages are recorded. Defaults to False.
+			traceMemory (bool, optional): Whether the memory Python allocates during each stage is recorded with tracemalloc. Defaults to False.
+		"""
+		self.enabled = enabled
+		self.traceMemory = traceMemory
+		self.records = []
+		#The most memory traced so far during each stage that is still running, so stages inside other stages don't lose their parent's peak
+		self.tracedPeaks = []
+
+	def Stage(self, name: str, **labels):
+		"""Returns a context manager that records the stage called name while it runs
+
+		Args:
+			name (str): The stage, such as "load" or "savefig"
+			**labels: What the stage is working on, such as dataset=path or frame=ns
+		"""
+		if not self.enabled:
+			return disabledStage
+		return self.Record(name, labels)
+
+	@contextlib.contextmanager
+	def Record(self, name: str, labels: dict):
+		import tracemalloc
+		#tracedPeaks is a stack of the stages running in the main thread, so stages in other threads only record time
+		tracing = self.traceMemory and tracemalloc.is_tracing() and threading.current_thread() is threading.main_thread()
+		if tracing:
+			if self.tracedPeaks:
+				self.tracedPeaks[-1] = max(self.tracedPeaks[-1], tracemalloc.get_traced_memory()[1])
+			tracemalloc.reset_peak()
+			self.tracedPeaks.append(0)
+		peak = PeakMemory()
+		wall, cpu = time.perf_counter(), time.process_time()
+		try:
+			yield
+		finally:
+			record = {"stage": name, **labels, "pid": os.getpid(), "wall": time.perf_counter() - wall, "cpu": time.process_time() - cpu}
+			if peak != None:
+				record["peakRssMiB"] = PeakMemory()
+				record["rssGrowthMiB"] = record["peakRssMiB"] - peak
+			if tracing:
+				traced = max(self.tracedPeaks.pop(), tracemalloc.get_traced_memory()[1])
+				if self.tracedPeaks:
+					self.tracedPeaks[-1] = max(self.tracedPeaks[-1], traced)
+				record["tracedPeakMiB"] = traced / 1024**2
+			self.records.append(record)
+
+	def Summary(self) -> dict[str, dict]:
+		"""Returns the number of times each stage ran, their total wall and CPU time, and the largest peak memory any of them reached
+		"""
+		summary = {}
+		for x in self.records:
+			stage = summary.setdefault(x["stage"], {"count": 0, "wall": 0.0, "cpu": 0.0})
+			stage["count"] += 1
+			stage["wall"] += x["wall"]
+			stage["cpu"] += x["cpu"]
+			for key in ["peakRssMiB", "tracedPeakMiB"]:
+				if key in x:
+					stage[key] = max(stage.get(key, 0), x[key])
+		return summary
+
+	def Write(self, path: str) -> None:
+		"""Saves every record to path, as CSV if it ends in .csv, otherwise as JSON along with the summary, and the lines that allocated the most memory if tracemalloc is running
+		"""
+		if path.lower().endswith(".csv"):
+			import csv
+			with open(path, "w", newline="") as file:
+				writer = csv.DictWriter(file, fieldnames=self.columns, extrasaction="ignore")
+				writer.writeheader()
+				writer.writerows(self.records)
+			return
+
+		report = {"summary": self.Summary(), "records": self.records}
+		import tracemalloc
+		if tracemalloc.is_tracing():
+			statistics = tracemalloc.take_snapshot().statistics("lineno")[:20]
+			report["allocations"] = [{"where": str(x.traceback), "sizeMiB": x.size / 1024**2, "count": x.count} for x in statistics]
+		with open(path, "w") as file:
+			json.dump(report, file, indent=4)
+
+"""Returned by Instrumentation.Stage while it is disabled"""
+disabledStage = contextlib.nullcontext()
+
+"""The stages recorded in this process, configured by the command line arguments"""
+instrumentation = Instrumentation()
+
+def collectRecords(function: Callable, *args) -> tuple[any, list[dict]]:
+	"""Calls function in a process from a pool, and returns what it returns along with the records it made, so they can be added to the main process's.
+	Forked processes start with a copy of the main process's records, so only the ones made during the call are returned.
+	"""
+	start = len(instrumentation.records)
+	result = function(*args)
+	records = instrumentation.records[start:]
+	del instrumentation.records[start:]
+	return result, records
+
+"""Data files that have already been parsed in this process, keyed by (path, maxRows, firstRow, columns), so a file shared by several figures is only parsed once even when the cache is disabled"""
+preloadedData = {}
+
+def LoadDataFile(path: str, maxRows: int = 0, mmap: bool = False, firstRow: int = 0, columns: tuple[int, int] = None) -> np.ndarray:
+	"""Loads a data file from preloadedData or the cache if it has been read before, otherwise reads it with ReadDataFile and caches the result.
+
+	Args:
+		path (str): The path to the data file
+		maxRows (int, optional): The row to stop reading before, 0 reads the whole file. Defaults to 0.
+		mmap (bool, optional): Memory-map the cached copy of the file instead of reading it into memory, so only the parts that are used are ever loaded. 
+			Has no effect when the cache is disabled. Defaults to False.
+		firstRow (int, optional): The first row to read. Defaults to 0.
+		columns (tuple[int, int], optional): The first and last (exclusive) column of values to read. Defaults to None, which reads every column.
+
+	Returns:
+		np.ndarray: The same array ReadDataFile returns, read-only if it is memory-mapped
+	"""
+	if (path, maxRows, firstRow, columns) in preloadedData:
+		return preloadedData[(path, maxRows, firstRow, columns)]
+	data = dataCache.Load(path, maxRows, firstRow, columns, mmap=mmap)
+	if data is None:
+		data = ReadDataFile(path, maxRows, firstRow, columns)
+		dataCache.Store(path, data, maxRows, firstRow, columns)
+		if mmap and dataCache.enabled:
+			#Swap the parsed copy for the memory-mapped one so it can be freed
+			data = dataCache.Load(path, maxRows, firstRow, columns, mmap=True)
+	return data
+
 class Dataset:
 	"""An object that stores the data and relevant information from each file:
 	"""
@@ -217,13 +1020,17 @@ class Dataset:
 		name (string): The name assigned to this set of data,
 		length (int): The number of rows in the file, used to initialize the list to avoid repeatedly appending,
 		data (int list list): The actual data stored in the file, Data[n][0]: row number, Data[n][1]: value associated with its row.
-		movAvg (int list): If the user wants a moving average, stores the value of that average, starting at index "amount"-1, leaving those indices None.
+		movAvg (np.ndarray): If the user wants a moving average, stores the value of that average for each column, frames without a full window are NaN.
 		amount (int): The number of frames for the moving average.
+		firstRow (int): The first row of the file that is read, data[0] is this row.
+		columns (tuple[int, int]): The first and last (exclusive) column of values that are read, or None for every column.
 		"""
 		self.name, self.path = None, None
 		self.length = length
-		self.data = []
-		self.movAvg = []
+		self.data = np.empty((0, 0))
+		self.movAvg = None
+		self.firstRow = 0
+		self.columns = None
 
 	def Prompt(self):
 		"""
@@ -235,92 +1042,121 @@ class Dataset:
 			print("That is not a valid file.")
 			self.path = input("What\'s the path to " + self.name + "?\n--- ")
 
-	def Populate(self):
+	def Populate(self, mmap = False):
 		"""
-		Reads in the provided path and stores all the data in self.data
+		Reads in the rows and columns of the provided path chosen by firstRow, length, and columns, and stores them in self.data, memory-mapped from the cache if mmap is True
 		"""
-		
-		if self.path[len(self.path)-4:] == ".tsv":
-			with open(self.path) as file:
-				rd = csv.reader(file, delimiter="\t")
-				for index, value in enumerate(rd):
-					if index != 0:
-						self.data[index] = [float(x) for x in value[1:]]
-		elif self.path[len(self.path)-4:] == ".csv":
-			with open(self.path) as file:
-				rd = csv.reader(file, delimiter=",")
-				for index, value in enumerate(rd):
-					# self.data[index] = [float(x) for x in value[1:]]
-					if index != 0:
-						self.data.append([float(x) for x in value[1:]])
-						# print(self.data[-1])
-		elif self.path[len(self.path)-4:] == ".dat":
-			print(f"Begin Reading {self.path}")
-			self.data = [0] * self.length
-			with open(self.path) as fd:
-				for lineNumber, line in enumerate(fd):
-					if lineNumber != 0 and lineNumber < len(self.data): #We don't want a header
-						#The file should be in the format: "   ###1      ###2", where ###1 is the index, and ###2 is the value
-						#The following line will, for each line, give the following list: ["   ###1", "      ###2"]
-						l = re.findall(" *-?\d+\.?\d*", line)
-						modified = [0] * len(l)
-						for index, value in enumerate(l):
-							modified[index] = float(value.replace(" ", ""))
-						#modified will now equal [###1, ###2]
-						if modified != []:
-							# modified[0] = float(modified[0])
-							self.data[lineNumber - 1] = modified
-			#self.data is now a list of lists, but we're only interested in the second value of each list
-			#if self.length is larger than the number of rows in the file, then there will be trailing zeros after the data,
-			#the inner loop comprehension removes them so that the zip doesn't throw an error
-			# print(self.data)
-			self.data = [[x[0], x[1:]] if type(x) == list else x for x in self.data]
-			# self.data = [list(i) for i in zip(*[x for x in self.data if x != 0])]
-			# print(self.data)
-			# for x in self.data:
-			# 	print(x)
-			self.data = [x[1] if type(x) == list else [x] for x in self.data]
-			# print(self.data)
-			print(self.data)
-			print(f"End Reading {self.path}")
-		else:
-			raise ValueError("Data file must be in .csv, .tsv, or .dat format.")
+		log.debug("Begin Reading %s", self.path)
+		with instrumentation.Stage("load", dataset = self.path):
+			self.data = LoadDataFile(self.path, self.length, mmap, self.firstRow, self.columns)
+		log.debug("End Reading %s", self.path)
 
-	def CalcMovingAvg(self, amount):
+	def CalcMovingAvg(self, amount, avgType = "trailing"):
 		"""
-		Calculates a moving average, given amount frames
+		Calculates a moving average of every column, given amount frames
 		"""
-		print(f"Begin Moving Average {self.path}")
-		# self.movAvg = [None] * self.length
-		self.movAvg = [None] * len(self.data)
+		log.debug("Begin Moving Average %s", self.path)
+		with instrumentation.Stage("moving average", dataset = self.path):
+			self.movAvg = MovingAverage(self.data, amount, avgType)
 		self.amount = amount
-		# for x in range(amount-1, self.length): #999 to 1001000
-		for x in range(amount-1, len(self.data)):
-			avg = 0
-			# print(f"Inner bound: {x - (amount-1)} to {x+1}, len movAvg: {len(self.movAvg)}")
-			for y in range(x - (amount-1), x+1): #999-999=0 to 1000
-				try:
-					avg += self.data[y]
-				except IndexError:
-					break;
-				except:
-					print("There's a problem with your file.")
-			avg /= amount
-			self.movAvg[x] = avg
-		print(f"End Moving Average {self.path}")
-
-	def AsDataFrame(self):
-		"""
-		Converts the Dataset to a DataFrame format
-		"""
-		if self.movAvg:
-			# print(f"Len data: {len(self.data)}, len avg: {len(self.movAvg)}")
-			dataFrame = pd.DataFrame({self.name : self.data, f"{self.name} {self.amount} Frame\nMov Avg" : self.movAvg})
-		else:
-			dataFrame = pd.DataFrame({self.name : self.data})
-		return dataFrame
+		log.debug("End Moving Average %s", self.path)
+
+	def Stream(self, chunkRows, points, movAvgFr = 0, avgType = "trailing", keep = (0, None)):
+		"""
+		Reads the first column of the file chunkRows rows at a time, downsampling it to points rows and calculating its moving average over movAvgFr frames as it is read, 
+		so neither the whole file nor self.data is ever held in memory. Only the rows from keep[0] up to keep[1] (None for the end) are kept, the others just warm up the moving average.
+		Returns the rows kept and their values, for the data and then for the moving average if there is one.
+		"""
+		def trim(values, row):
+			return values[max(keep[0] - row, 0):None if keep[1] == None else max(keep[1] - row, 0)]
+
+		log.debug("Begin Streaming %s", self.path)
+		data = StreamingDownsample(points)
+		movAvg = StreamingDownsample(points) if movAvgFr else None
+		average = StreamingMovingAverage(movAvgFr, avgType) if movAvgFr else None
+		dataRow = averageRow = self.firstRow
+		with instrumentation.Stage("stream", dataset = self.path):
+			for chunk in StreamDataFile(self.path, chunkRows, self.length, self.firstRow):
+				data.Push(trim(chunk, dataRow))
+				dataRow += len(chunk)
+				if movAvg != None:
+					means = average.Push(chunk)
+					movAvg.Push(trim(means, averageRow))
+					averageRow += len(means)
+			if movAvg != None:
+				movAvg.Push(trim(average.Finish(), averageRow))
+				self.amount = movAvgFr
+		log.debug("End Streaming %s", self.path)
+		#The first row pushed was keep[0], or firstRow if that is later
+		start = max(keep[0], self.firstRow)
+		return [(rows + start, values) for rows, values in [data.Result()] + ([movAvg.Result()] if movAvg != None else [])]
+
+class Series:
+	"""One named set of values in a subplot, along with the x value of each row
+	"""
+	def __init__(self, name: str, x: np.ndarray, values: np.ndarray, path: str = None, firstFrame: int = 0) -> None:
+		"""
+		Args:
+			name (str): The name shown in the legend
+			x (np.ndarray): The x value of each row, usually a view of an array shared by the whole subplot
+			values (np.ndarray): values[n][m] is the value of column m on row n
+			path (str, optional): The file the values were read from. Defaults to None.
+			firstFrame (int, optional): The nanosecond of the first pair of columns, when only some of a Ramachandran dataset's columns were read. Defaults to 0.
+		"""
+		self.name = name
+		self.x = x
+		self.values = values
+		self.path = path
+		self.firstFrame = firstFrame
+		self.frames = None
+
+	def Frames(self) -> np.ndarray:
+		"""Returns the values of a Ramachandran dataset as a (nanoseconds × rows × 2) array, so Frames()[ns - firstFrame] holds the phi/psi pair of every row for nanosecond ns.
+		The array is built once and is a view of the column-major values, so each nanosecond's angles are a contiguous slice and nothing is copied for memory-mapped data.
+		"""
+		if self.frames is None:
+			values = np.asfortranarray(self.values[:, :self.values.shape[1] // 2 * 2])
+			self.frames = values.T.reshape(-1, 2, len(values)).transpose(0, 2, 1)
+		return self.frames
+
+	def Frame(self, ns: int) -> np.ndarray:
+		"""Returns the phi/psi pair of every row for nanosecond ns
+		"""
+		return self.Frames()[ns - self.firstFrame]
+
+class SubplotData:
+	"""All of the data in one subplot, in wide format: one array per series plus the x values, with no repeated labels.
+	"""
+	def __init__(self, series: list[Series]) -> None:
+		self.series = series
+		self.index = {x.name: x for x in series}
+
+	def __iter__(self):
+		return iter(self.series)
+
+	def __len__(self) -> int:
+		return len(self.series)
+
+	def Get(self, name: str) -> Series:
+		"""Returns the series called name
+		"""
+		return self.index[name]
+
+	def AsLongFormat(self) -> pd.DataFrame:
+		"""Converts the data to long format, with one row per value and the columns index, variable, column, and value. 
+		This copies every value, so it should only be used when something needs it, such as seaborn.
+		"""
+		frames = []
+		for x in self.series:
+			rows, columns = x.values.shape
+			frames.append(pd.DataFrame({"index": np.tile(x.x, columns), "variable": x.name, "column": np.repeat(np.arange(columns), rows), "value": x.values.ravel(order="F")}))
+		return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame({"index": [], "variable": [], "column": [], "value": []})
 
 class Preset:
+	"""The values of a preset are stored in a PresetValues, which shares the Values describing them with every other preset of the same type.
+	"""
+	__slots__ = ("values",)
+
 	def asString(self, showAdvanced) -> str:
 		"""Returns the Preset as a string of its values
 
@@ -331,14 +1167,14 @@ class Preset:
 			str: String of Preset values, each on a new line with title
 		"""
 		toReturn = ""
-		for x in list(self.values.values()):
+		for x in self.values.values():
 			if not (x.advancedOption == True and showAdvanced == False):
-				if "type" in list(map(lambda x: x.name, list(self.values.values()))):
+				if "type" in self.values:
 					if self.values["type"].value in x.restrictType or x.restrictType == []:
 						toReturn += f"{x.display}{x.value}\n"
 				else:
 					toReturn += f"{x.display}{x.value}\n"
-		if showAdvanced == False and reduce(lambda x: x.advancedOption, False, lambda x, y: x or y, list(self.values.values())):
+		if showAdvanced == False and any(x.advancedOption for x in self.values.schema.fields):
 			toReturn += "---Advanced Options Hidden---"
 		return toReturn
 	
@@ -348,7 +1184,7 @@ class Preset:
 		Returns:
 			dict[str, any]: A dictionary containing the name and value associated with each value in the Preset
 		"""
-		return {n.name: n.value for n in list(self.values.values())}
+		return dict(zip(self.values.schema.names, self.values.slots))
 
 	def copy(self, Preset):
 		"""Returns a copy of itself
@@ -356,18 +1192,21 @@ class Preset:
 		Returns:
 			Preset: Copy of itself
 		"""
-		#Takes the name, Value dictionary of values (self.values), extracts the values and converts it to a list of Values.
-		#Then uses list comprehension to extract the value attribute from each Value object.
-		#Finally, unpacks the list and passes it into the Preset constructor
-		return Preset(*[x.value for x in list(self.values.values())])
+		#Only the list of values is copied, instead of calling the constructor again
+		toReturn = Preset.__new__(Preset)
+		toReturn.values = self.values.copy()
+		return toReturn
 
 class AxisPreset(Preset):
 	"""
 	An established group of settings by which to graph data.
 	"""
+	__slots__ = ()
+
 	def __init__(self, name: str = "", comment: str = "", type: str = "", numRows: int = 0, numPlots: int = 0, xAxisTitle: str = "", yAxisTitle: str = "", movAvg: bool = False, 
-	    	movAvgFr: int = 0, movAvgName: str = "", onlyMovAvg: bool = False, palette: list[str] = [], color: list[str] = [], xLimit: list[int] = [], xTicks: list[str] = [], xTicksType: str = "float", xTicksMinor: list[int] = [], xMinorTicksType: str = "float", 
-			xScale: int = 1, xOffset: int = 0, yLimit: int = 0, yTicks: list[int] = [], yTicksType: str = "float", yTicksMinor: list[int] = [], yMinorTicksType: str = "float", yScale: int = 0, yOffset: int = 0, startNs: int = 0, endNs: int = 0, indexOffset : int = 0):
+	    	movAvgFr: int = 0, movAvgName: str = "", onlyMovAvg: bool = False, movAvgType: str = "trailing", downsample: int = 0, lineBackend: str = "matplotlib", chunkRows: int = 0, readXLimit: bool = False, palette: list[str] = [], color: list[str] = [], xLimit: list[int] = [], xTicks: list[str] = [], xTicksType: str = "float", xTicksMinor: list[int] = [], xMinorTicksType: str = "float", 
+			xScale: int = 1, xOffset: int = 0, yLimit: int = 0, yTicks: list[int] = [], yTicksType: str = "float", yTicksMinor: list[int] = [], yMinorTicksType: str = "float", yScale: int = 0, yOffset: int = 0, startNs: int = 0, endNs: int = 0, indexOffset : int = 0, 
+			rasterize: bool = False, density: str = "points", gridSize: int = 72):
 		"""_summary_
 
 		Args:
@@ -382,6 +1221,11 @@ class AxisPreset(Preset):
 			movAvgFr (int, optional): If there is a moving average, the number of frames. Defaults to 0.
 			movAvgName (str, optional): The name of the moving average to appear in the legend of the picture.
 			onlyMovAvg (bool, optional): Should both the data and the moving average be plotted, or just the moving average?
+			movAvgType (str, optional): How the moving average is calculated, one of MovingAverageTypes. Defaults to "trailing".
+			downsample (int, optional): The largest number of points drawn for each line, 0 draws every point. Defaults to 0.
+			lineBackend (str, optional): What draws the lines, one of LineBackends. Defaults to "matplotlib".
+			chunkRows (int, optional): Stream the data this many rows at a time instead of reading the whole file, 0 reads the whole file. Defaults to 0.
+			readXLimit (bool, optional): Only read the rows inside xLimit. Defaults to False.
 			palette (list[str], optional): A list of hex values corresponding to the color of plots. Defaults to [].
 			color (list[str], optional): The colors/gradients if the user is graphing a scatter plot. Defaults to [].
 			xLimit (list[int], optional): The maximum value shown on the X-Axis. Defaults to [].
@@ -401,43 +1245,18 @@ class AxisPreset(Preset):
 			startNs (int, optional): If the user is plotting a range of nanoseconds, what is the starting value? Defaults to 0.
 			endNs (int, optional): If the user is plotting a range of nanoseconds, what is the end value? Defaults to 0.
 			indexOffset (int, optional): Adds an offset to the nanosecond count. Defaults to 0.
+			rasterize (bool, optional): Draw the points as pixels, even in vector formats. Defaults to False.
+			density (str, optional): How the points of a Ramachandran plot are drawn, one of DensityModes. Defaults to "points".
+			gridSize (int, optional): The number of cells along each axis of a hexbin or histogram. Defaults to 72.
 		"""
-		self.values = copy.deepcopy(AxisValues)
-		self.values["name"].value = name
-		self.values["comment"].value = comment
-		self.values["type"].value = type
-		self.values["numRows"].value = numRows
-		self.values["numPlots"].value = numPlots
-		self.values["xAxisTitle"].value = xAxisTitle
-		self.values["yAxisTitle"].value = yAxisTitle
-		self.values["movAvg"].value = movAvg
-		self.values["movAvgFr"].value = movAvgFr
-		self.values["movAvgName"].value = movAvgName
-		self.values["onlyMovAvg"].value = onlyMovAvg
-		self.values["palette"].value = palette
-		self.values["color"].value = color
-		self.values["xLimit"].value = xLimit
-		self.values["xTicks"].value = xTicks
-		self.values["xTicksType"].value = xTicksType
-		self.values["xTicksMinor"].value = xTicksMinor
-		self.values["xMinorTicksType"].value = xMinorTicksType
-		self.values["xScale"].value = xScale
-		self.values["xOffset"].value = xOffset
-		self.values["yLimit"].value = yLimit
-		self.values["yTicks"].value = yTicks
-		self.values["yTicksType"].value = yTicksType
-		self.values["yTicksMinor"].value = yTicksMinor
-		self.values["yMinorTicksType"].value = yMinorTicksType
-		self.values["yScale"].value = yScale
-		self.values["yOffset"].value = yOffset
-		self.values["startNs"].value = startNs
-		self.values["endNs"].value = endNs
-		self.values["indexOffset"].value = indexOffset
+		self.values = PresetValues(AxisSchema, [name, comment, type, numRows, numPlots, xAxisTitle, yAxisTitle, movAvg, movAvgFr, movAvgName, onlyMovAvg, movAvgType, downsample, lineBackend, chunkRows, readXLimit, palette, color, xLimit, xTicks, xTicksType, xTicksMinor, xMinorTicksType, xScale, xOffset, yLimit, yTicks, yTicksType, yTicksMinor, yMinorTicksType, yScale, yOffset, startNs, endNs, indexOffset, rasterize, density, gridSize])
 	
 
 class FigurePreset(Preset):
+	__slots__ = ()
+
 	def __init__(self, name : str = "", comment : str = "", rows : int = 0, cols : int = 0, numSubFigures : int = -1, widthRatios : list[int] = [], 
-	    	heightRatios: list[int] = [], width : int = 0, height : int = 0) -> None:
+	    	heightRatios: list[int] = [], width : int = 0, height : int = 0, dpi : int = 500, format : str = "", compression : int = 6, quality : int = 0, reuseBbox : bool = False) -> None:
 		"""
 		Args:
 			name (str, optional): The name of this group of settings. Defaults to "".
@@ -449,19 +1268,17 @@ class FigurePreset(Preset):
 			heightRatios (list[int], optional): The ratio of hights of rows of sub-figures. Defaults to [].
 			width (int, optional): The width of the image. Defaults to 0.
 			height (int, optional): The hight of the image. Defaults to 0.
+			dpi (int, optional): The resolution pictures are saved with. Defaults to 500.
+			format (str, optional): The format pictures are saved in, one of PixelFormats, or "" to use the extension of the picture's name. Defaults to "".
+			compression (int, optional): The zlib compression level of PNG pictures, from 0 to 9. Defaults to 6.
+			quality (int, optional): The quality of WebP and JPEG pictures, from 1 to 100, or 0 for the default of the format. Defaults to 0.
+			reuseBbox (bool, optional): Calculate the area of the figure that is saved for the first frame only, and reuse it for the rest. Defaults to False.
 		"""
-		self.values = copy.deepcopy(FigureValues)
-		self.values["name"].value = name
-		self.values["comment"].value = comment
-		self.values["rows"].value = rows
-		self.values["cols"].value = cols
-		self.values["numSubFigures"].value = rows * cols if numSubFigures < 0 else numSubFigures
-		self.values["widthRatios"].value = widthRatios
-		self.values["heightRatios"].value = heightRatios
-		self.values["width"].value = width
-		self.values["height"].value = height
+		self.values = PresetValues(FigureSchema, [name, comment, rows, cols, rows * cols if numSubFigures < 0 else numSubFigures, widthRatios, heightRatios, width, height, dpi, format, compression, quality, reuseBbox])
 
 class SubplotPreset(Preset):
+	__slots__ = ()
+
 	def __init__(self, name: str, comment : str = "", rows : int = 0, cols : int = 0, numSubPlots : int = -1, widthRatios : list[int] = [], heightRatios : list[int] = [],
 	    	shareX : bool = False, shareY : bool = False) -> None:
 		"""
@@ -476,18 +1293,9 @@ class SubplotPreset(Preset):
 			shareX (bool, optional): Should the subplots share the same X-Axis? Defaults to False.
 			shareY (bool, optional): Should the subplots share the same Y-Axis? Defaults to False.
 		"""
-		self.values = copy.deepcopy(SubplotValues)
-		self.values["name"].value = name
-		self.values["comment"].value = comment
-		self.values["rows"].value = rows
-		self.values["numSubPlots"].value = numSubPlots
-		self.values["cols"].value = cols
-		self.values["widthRatios"].value = widthRatios
-		self.values["heightRatios"].value = heightRatios
-		self.values["shareX"].value = shareX
-		self.values["shareY"].value = shareY
+		self.values = PresetValues(SubplotSchema, [name, comment, rows, cols, numSubPlots, widthRatios, heightRatios, shareX, shareY])
 
-def new(Presets, presetFile, presetType):
+def new(Presets: PresetStore, presetType):
 	"""
 	Handles when the user wants to create a new Preset.
 
@@ -529,18 +1337,14 @@ If you choose to save your file and you have not chosen a unique name, it will o
 		save = input("Would you like to save this preset? (Y/N)\n--- ")
 
 	if save == "Y":
-		#converts this preset to a dictionary
-		dict = {Preset.values["name"].value: Preset.getValues()}
-		#Converts all the other presets to dictionaries and combines them all together
-		for x in list(Presets.values()):
-			dict |= {x.values["name"].value: x.getValues()}
-
-		with open(presetFile, "w", encoding="utf-8") as f:
-			json.dump(dict, f, ensure_ascii=False, indent=4)
+		#Only this preset is written, the others are left as they are
+		Presets.Save(Preset)
+	else:
+		Presets.Add(Preset)
 
-	return Preset, Presets | {Preset.values["name"].value, Preset}
+	return Preset, Presets
 
-def modify(Presets, presetFile, presetType) -> AxisPreset:
+def modify(Presets: PresetStore, presetType) -> AxisPreset:
 	"""
 	Handles when the user wants to modify an existing Preset.
 
@@ -591,17 +1395,12 @@ Otherwise it will save as a copy of the original.")
 		save = input("Would you like to save this preset? (Y/N)\n--- ")
 
 	if save == "Y":
-		#Converts this preset to a dictionary
-		dict = {}
-		for x in list(Presets.values()):
-			#Converts each other preset to a dictionary and combines them all together
-			dict |= {x.values["name"].value: x.getValues()}
-		dict |= {oldPreset.values["name"].value: oldPreset.getValues()}
-
-		with open(presetFile, "w", encoding="utf-8") as f:
-			json.dump(dict, f, ensure_ascii=False, indent=4)
+		#Only this preset is written, the others are left as they are
+		Presets.Save(oldPreset)
+	else:
+		Presets.Add(oldPreset)
 
-	return oldPreset, Presets | {oldPreset.values["name"].value: oldPreset}
+	return oldPreset, Presets
 
 def greeting(Presets, presetFile) -> list[str]:
 	"""
@@ -632,30 +1431,29 @@ or enter \"modify\" if you would like to edit an existing preset.")
 
 	return keys
 
-def getPreset(Presets, presetFile, keys, presetType) -> AxisPreset:
+def getPreset(Presets, keys, presetType) -> AxisPreset:
 	"""
 	Determines which AxisPreset they would like to use, if they would like to create a new AxisPreset, or modify an existing AxisPreset.
 
 	Returns the AxisPreset they have chosen to use.
 
 	Args:
-		AxisPresets (AxisPreset dict): The user's loaded AxisPresets
-		presetFile (string): a string locating the user's file or presets
+		AxisPresets (PresetStore): The user's saved AxisPresets
 		keys (string list): a list of strings of acceptable user input
 	"""
 
 	preset = input("\n--- ")
-	while preset not in keys or (preset == "modify" and Presets == {}) or (preset[:8] == "advanced" and Presets == {}):
+	while preset not in keys or (preset == "modify" and len(Presets) == 0) or (preset[:8] == "advanced" and len(Presets) == 0):
 		print("Invalid input.")
 		preset = input("\n--- ")
 
 	if preset == "new":
-		preset, Presets = new(Presets, presetFile, presetType)
+		preset, Presets = new(Presets, presetType)
 	elif preset == "modify":
-		preset, Presets = modify(Presets, presetFile, presetType)
+		preset, Presets = modify(Presets, presetType)
 	elif preset[:8] == "advanced":
 		print(Presets[preset[9:]].asString(True))
-		return getPreset(Presets, presetFile, keys, presetType)
+		return getPreset(Presets, keys, presetType)
 	else:
 		preset = Presets[preset]
 
@@ -682,39 +1480,141 @@ def getVariableValues(numSubplots: str) -> tuple[str, str, list[str], list[str]]
 		subplotTitles.append(temp)
 	return (pictureName, title, subfigureTitles, subplotTitles)
 
-def populateDatasets(axisPresetList: list[list[AxisPreset]], numSubPlots: list[int], subplotTitles: list[str]) -> pd.DataFrame:
-	"""Populates each dataset by getting input from the user
+def renderedFrames(axisPresetList: list[list[AxisPreset]]) -> tuple[int, int] | None:
+	"""Returns the first and last (exclusive) pair of columns of Ramachandran data that plotHelper renders, or None if there are no Ramachandran plots
+	"""
+	if not any(x.values["type"].value == "Ramachandran" for row in axisPresetList for x in row):
+		return None
+	start, end, offset = getStartEndOffset(axisPresetList)
+	return start - offset, end - offset
+
+def ReadRange(axisPreset: AxisPreset, frames: tuple[int, int] = None, path: str = None) -> tuple[int, int, int, int | None, tuple[int, int] | None]:
+	"""Works out which part of a data file a subplot shows, so only that part is read.
+	numRows only limits .dat files, .csv and .tsv files are read to the end.
+
+	A line plot with an xLimit and readXLimit set only needs the rows inside the xLimit, plus one on either side so the line reaches the edges of the plot, 
+	and the rows its moving average needs to be correct at the first and last of them: window-1 rows before a trailing average, and half a window on either side of a centered one.
+	An exponential average depends on every earlier row, so it is always read from the start.
+	A Ramachandran plot only needs the two columns of each nanosecond in frames.
 
 	Args:
-		axisPresetList (list[list[AxisPreset]]): List of all the presets loaded
+		axisPreset (AxisPreset): The preset of the subplot
+		frames (tuple[int, int], optional): The first and last (exclusive) pair of columns rendered, from renderedFrames. Defaults to None, which reads every column.
+		path (str, optional): The data file. Defaults to None, which treats it as a .dat file.
 
 	Returns:
-		pd.DataFrame: Dataframe containing all the data for the graph
+		tuple[int, int, int, int | None, tuple[int, int] | None]: The first row to read, the row to stop reading before (0 for the end of the file), 
+			the first row to keep and the row to stop keeping before (None for the end) once the moving average is calculated, and the columns to read (None for every column). 
+			An xLimit before the first row gives an empty range starting and ending at row 1.
+	"""
+	maxRows = axisPreset.values["numRows"].value if path == None or path.endswith(".dat") else 0
+	limit = axisPreset.values["xLimit"].value
+	columns = None
+	if axisPreset.values["type"].value == "Ramachandran" and frames != None and frames[0] >= 0:
+		columns = (2 * frames[0], 2 * frames[1])
+	if axisPreset.values["type"].value != "line" or not limit or not axisPreset.values["readXLimit"].value:
+		return 0, maxRows, 0, None, columns
+
+	xScale = axisPreset.values["xScale"].value or 1
+	xOffset = axisPreset.values["xOffset"].value or 0
+	#Row n is drawn at n / xScale + xOffset
+	low, high = sorted([(limit[0] - xOffset) * xScale, (limit[1] - xOffset) * xScale])
+	keepFrom = max(int(np.ceil(low)) - 1, 0)
+	keepTo = int(np.floor(high)) + 2
+	if keepTo <= keepFrom:
+		#The xLimit ends before the first row, so nothing is read. The range can't start at row 0, since reading up to row 0 reads the whole file
+		return 1, 1, 1, 1, columns
+	readFrom, readTo = keepFrom, keepTo
+	if axisPreset.values["movAvg"].value:
+		window = axisPreset.values["movAvgFr"].value
+		match axisPreset.values["movAvgType"].value:
+			case "trailing":
+				readFrom -= window - 1
+			case "centered":
+				readFrom -= window // 2
+				readTo += window - 1 - window // 2
+			case "exponential":
+				readFrom = 0
+	readFrom = max(readFrom, 0)
+	if maxRows:
+		readTo = min(readTo, maxRows)
+	return readFrom, readTo, keepFrom, keepTo, columns
+
+def seriesNames(axisPreset: AxisPreset, dataset: Dataset) -> list[str]:
+	"""Returns the name of every series drawn from dataset in a subplot drawn with axisPreset, in the order populateDatasets adds them
 	"""
+	names = [dataset.name]
+	if axisPreset.values["movAvg"].value:
+		names.append(axisPreset.values["movAvgName"].value.replace("[NAME]", dataset.name).replace("[NUM]", str(axisPreset.values["movAvgFr"].value)))
+		if axisPreset.values["onlyMovAvg"].value:
+			names = names[1:]
+	return names
 
-	dataPlots = []
+def collectDatasets(axisPresetList: list[list[AxisPreset]], numSubPlots: list[int], subplotTitles: list[str], datasetSpecs: list[list[list[dict[str, str]]]] = None) -> list[list[list[Dataset]]]:
+	"""Gets the name and path of each dataset from the user, or from datasetSpecs if it is given, without reading any data
+
+	Args:
+		axisPresetList (list[list[AxisPreset]]): List of all the presets loaded
+		datasetSpecs (list[list[list[dict[str, str]]]], optional): The "name" and "path" of each dataset in each subplot of each subfigure. Defaults to None, which prompts the user.
+
+	Returns:
+		list[list[list[Dataset]]]: The unloaded datasets of each subplot of each subfigure
+	"""
+	#Only the rows and columns each subplot shows are read
+	frames = renderedFrames(axisPresetList)
+	datasets = []
 	for index, i in enumerate(numSubPlots):
-		temp = [pd.DataFrame({})] * i
+		temp = [[]] * i
 		for j in range(i):
 			plots = []
-			print(f"We will now begin loading in data for the plot labeled {subplotTitles[index][j]}:")
-			# print(axisPresetList[index][j].values["name"].value, axisPresetList[index][j].values["numPlots"].value)
-			for x in range(axisPresetList[index][j].values["numPlots"].value):
-				x = Dataset(axisPresetList[index][j].values["numRows"].value)
-				x.Prompt()
-				plots.append(x)
-
+			if datasetSpecs != None:
+				for spec in datasetSpecs[index][j]:
+					x = Dataset(0)
+					x.name, x.path = spec["name"], spec["path"]
+					if not os.path.isfile(x.path):
+						raise FileNotFoundError(f"{x.path} is not a valid file.")
+					plots.append(x)
+			else:
+				print(f"We will now begin loading in data for the plot labeled {subplotTitles[index][j]}:")
+				for x in range(axisPresetList[index][j].values["numPlots"].value):
+					x = Dataset(0)
+					x.Prompt()
+					plots.append(x)
 			for x in plots:
-				x.Populate()
-				temp[j] = pd.concat([temp[j], x.AsDataFrame()], axis = 1)
-				if axisPresetList[index][j].values["movAvg"].value:
-					# temp[j][f"{x.name} " + str(axisPresetList[index][j].values["movAvgFr"].value) + " Frame Mov. Avg."] = temp[j][x.name].apply(lambda x: x[0]).rolling(window = axisPresetList[index][j].values["movAvgFr"].value).mean()
-					movAvgName = axisPresetList[index][j].values["movAvgName"].value.replace("[NAME]", x.name).replace("[NUM]", str(axisPresetList[index][j].values["movAvgFr"].value))
-					temp[j][movAvgName] = temp[j][x.name].apply(lambda x: x[0]).rolling(window = axisPresetList[index][j].values["movAvgFr"].value).mean()
-					if axisPresetList[index][j].values["onlyMovAvg"].value:
-						temp[j] = temp[j].drop(x.name, axis=1)
-
-			temp[j].reset_index(inplace=True)
+				x.firstRow, x.length, _, _, x.columns = ReadRange(axisPresetList[index][j], frames, x.path)
+			temp[j] = plots
+		datasets.append(temp)
+	return datasets
+
+def populateDatasets(axisPresetList: list[list[AxisPreset]], numSubPlots: list[int], subplotTitles: list[str], jobs: int = 1, datasetSpecs: list[list[list[dict[str, str]]]] = None, 
+		datasets: list[list[list[Dataset]]] = None) -> list[list[SubplotData]]:
+	"""Populates each dataset by getting input from the user, or from datasetSpecs if it is given.
+	Every path is collected first, then the files are loaded in parallel, and finally the data is assembled in the original order.
+
+	Args:
+		axisPresetList (list[list[AxisPreset]]): List of all the presets loaded
+		jobs (int, optional): The largest number of files to parse at once. Defaults to 1.
+		datasetSpecs (list[list[list[dict[str, str]]]], optional): The "name" and "path" of each dataset in each subplot of each subfigure. Defaults to None, which prompts the user.
+		datasets (list[list[list[Dataset]]], optional): The datasets from collectDatasets, if they were already collected. Defaults to None.
+
+	Returns:
+		list[list[SubplotData]]: The data for each subplot of each subfigure
+	"""
+	frames = renderedFrames(axisPresetList)
+	ranges = [[ReadRange(axisPresetList[index][j], frames) for j in range(i)] for index, i in enumerate(numSubPlots)]
+	if datasets == None:
+		datasets = collectDatasets(axisPresetList, numSubPlots, subplotTitles, datasetSpecs)
+
+	#Ramachandran plots only ever look at two columns at a time, so their data stays on disk until it is needed. Streamed data is read while the subplot is assembled.
+	streamed = [[axisPresetList[index][j].values["type"].value == "line" and axisPresetList[index][j].values["chunkRows"].value for j in range(i)] for index, i in enumerate(numSubPlots)]
+	loadDatasets([(x, axisPresetList[index][j].values["type"].value == "Ramachandran") 
+		for index, i in enumerate(numSubPlots) for j in range(i) if not streamed[index][j] for x in datasets[index][j]], jobs)
+
+	dataPlots = []
+	for index, i in enumerate(numSubPlots):
+		temp = [SubplotData([])] * i
+		for j in range(i):
+			plots = datasets[index][j]
 			xScale = axisPresetList[index][j].values["xScale"].value
 			yScale = axisPresetList[index][j].values["yScale"].value
 			xOffset = axisPresetList[index][j].values["xOffset"].value
@@ -729,19 +1629,98 @@ def populateDatasets(axisPresetList: list[list[AxisPreset]], numSubPlots: list[i
 			if yOffset == None:
 				yOffset = 0
 
-			temp[j]["index"] = temp[j]["index"].apply(lambda x: x/xScale + xOffset)
-			for x in plots:
-				if x.name in temp[j].columns:
-					if type(temp[j][x.name].iloc[0]) == list:
-						# print(temp[j][x.name])
-						temp[j][x.name] = temp[j][x.name].apply(lambda y: [item/yScale + yOffset for item in y] if type(y) == list else y)
-					else:
-						temp[j][x.name] = temp[j][x.name].apply(lambda y: y/yScale + yOffset)
-
-			temp[j] = pd.melt(temp[j], ["index"])
+			firstRow, _, keepFrom, keepTo, columns = ranges[index][j]
+			keep = slice(keepFrom - firstRow, None if keepTo == None else keepTo - firstRow)
+			#Every series in the subplot shares one array of x values, each series uses as much of it as it needs
+			xValues = (firstRow + np.arange(max([len(dataset.data) for dataset in plots], default=0))) / xScale + xOffset
+			series = []
+			for dataset in plots:
+				movAvg = axisPresetList[index][j].values["movAvg"].value
+				if streamed[index][j]:
+					#Only the rows that will be drawn were kept, so each series gets the x values of its own rows
+					kept = dataset.Stream(axisPresetList[index][j].values["chunkRows"].value, axisPresetList[index][j].values["downsample"].value, 
+						axisPresetList[index][j].values["movAvgFr"].value if movAvg else 0, axisPresetList[index][j].values["movAvgType"].value, (keepFrom, keepTo))
+					xs = [rows / xScale + xOffset for rows, _ in kept]
+					values = [value[:, np.newaxis] for _, value in kept]
+				else:
+					values = [dataset.data]
+					if movAvg:
+						dataset.CalcMovingAvg(axisPresetList[index][j].values["movAvgFr"].value, axisPresetList[index][j].values["movAvgType"].value)
+						values.append(dataset.movAvg)
+					#The rows read only to warm up the moving average are dropped
+					xs = [xValues[:len(value)][keep] for value in values]
+					values = [value[keep] for value in values]
+				#Only the data itself is scaled, the moving average is drawn from the unscaled values
+				scaled = [True, False][:len(values)]
+				if movAvg and axisPresetList[index][j].values["onlyMovAvg"].value:
+					xs, values, scaled = xs[1:], values[1:], scaled[1:]
+				for name, x, value, scale in zip(seriesNames(axisPresetList[index][j], dataset), xs, values, scaled):
+					#Scaling is skipped when it does nothing, so memory-mapped data is never copied
+					if scale and (yScale != 1 or yOffset != 0):
+						with instrumentation.Stage("scale", dataset = dataset.path):
+							value = value / yScale + yOffset
+					series.append(Series(name, x, value, dataset.path, columns[0] // 2 if columns else 0))
+			temp[j] = SubplotData(series)
 		dataPlots.append(temp)
 	return dataPlots
 
+def CacheDataFile(path: str, maxRows: int, firstRow: int, columns: tuple[int, int] | None, cache: DataCache) -> np.ndarray | None:
+	"""Parses a data file in a worker process. 
+	When the cache is enabled the data is only stored in it, so it doesn't need to be sent back to the main process, and None is returned. Otherwise the data is returned.
+
+	Args:
+		path (str): The path to the data file
+		maxRows (int): The row to stop reading before, 0 reads the whole file
+		firstRow (int): The first row to read
+		columns (tuple[int, int] | None): The first and last (exclusive) column of values to read, None reads every column
+		cache (DataCache): The cache used by the main process
+
+	Returns:
+		np.ndarray | None: The data, or None if it was stored in the cache
+	"""
+	global dataCache
+	dataCache = cache
+	with instrumentation.Stage("parse", dataset = path):
+		data = LoadDataFile(path, maxRows, True, firstRow, columns)
+	return None if cache.enabled else data
+
+def prefetchFiles(files: list[tuple[str, int, int, tuple[int, int] | None]], jobs: int = 1) -> None:
+	"""Parses each distinct file once, up to jobs at a time in a pool of processes, so loading it later is fast. 
+	Parsed files are stored in the cache, or in preloadedData if the cache is disabled.
+
+	Args:
+		files (list[tuple[str, int, int, tuple[int, int] | None]]): The path, maxRows, firstRow, and columns of each file, duplicates are only parsed once
+		jobs (int, optional): The largest number of processes to use. Defaults to 1.
+	"""
+	files = [x for x in dict.fromkeys(files) if x not in preloadedData]
+	if jobs > 1 and len(files) > 1:
+		with ProcessPoolExecutor(max_workers = min(jobs, len(files))) as pool:
+			futures = {file: pool.submit(collectRecords, CacheDataFile, *file, dataCache) for file in files}
+			parsed = {}
+			for file, future in futures.items():
+				parsed[file], records = future.result()
+				instrumentation.records += records
+	else:
+		parsed = {file: CacheDataFile(*file, dataCache) for file in files}
+
+	for file, data in parsed.items():
+		if data is not None:
+			preloadedData[file] = data
+
+def loadDatasets(datasets: list[tuple[Dataset, bool]], jobs: int = 1) -> None:
+	"""Populates every dataset, parsing up to jobs different files at once in a pool of processes. Each file is only parsed once, even if several datasets use it.
+
+	Args:
+		datasets (list[tuple[Dataset, bool]]): The datasets to populate, and whether each one should be memory-mapped
+		jobs (int, optional): The largest number of processes to use. Defaults to 1.
+	"""
+	if jobs > 1:
+		prefetchFiles([(x.path, x.length, x.firstRow, x.columns) for x, _ in datasets], jobs)
+
+	for x, mmap in datasets:
+		#Files parsed by the pool are now in the cache or preloadedData, so this is fast
+		x.Populate(mmap)
+
 def loadPresets(Presets: dict[str, Preset], presetFile: str, presetType) -> dict[str, AxisPreset]:
 	"""Reads in any presets from presetFile and appends them to a dictionary.
 
@@ -772,6 +1751,150 @@ def loadPresets(Presets: dict[str, Preset], presetFile: str, presetType) -> dict
 
 	return Presets
 
+class PresetStore:
+	"""Presets of one type, kept in an SQLite database so one preset can be found by name without reading every other one, and saved without rewriting every other one.
+
+	Used like the dictionary loadPresets returns, but a preset is only constructed the first time it is asked for.
+	The JSON preset file of the same type is imported again whenever it changes, so presets written there by hand or pulled from elsewhere still appear, and Export writes the database back out to it.
+	A preset saved to the database since it was last exported is never replaced by the file's version of it.
+	Each process opens its own connection, and every write is a transaction that waits for the others, so several batch processes can use the same database at once.
+	"""
+	"""Connections a forked process inherited from its parent. SQLite connections must not be closed in a process they weren't opened in, so they are kept here instead"""
+	inherited = []
+
+	def __init__(self, path: str, presetType, presetFile: str = None) -> None:
+		"""
+		Args:
+			path (str): The SQLite database, created if it doesn't exist
+			presetType: The type of preset stored, such as AxisPreset
+			presetFile (str, optional): The JSON preset file of the same type imported into the database. Defaults to None.
+		"""
+		self.path = path
+		self.presetType = presetType
+		self.presetFile = presetFile
+		self.presets = {}
+		self.connection = None
+		self.pid = None
+
+	def __getstate__(self) -> dict:
+		#Connections can't be sent to another process, it opens its own
+		return self.__dict__ | {"presets": {}, "connection": None, "pid": None}
+
+	def Connect(self) -> sqlite3.Connection:
+		"""Returns this process's connection to the database, opening it and importing presetFile if it hasn't been already
+		"""
+		if self.connection == None or self.pid != os.getpid():
+			if self.connection != None:
+				PresetStore.inherited.append(self.connection)
+			self.connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+			self.pid = os.getpid()
+			#Readers don't block the writer, or each other
+			self.connection.execute("PRAGMA journal_mode=WAL")
+			with self.Transaction() as connection:
+				#edited marks presets saved to the database that the preset file doesn't have yet
+				connection.execute("CREATE TABLE IF NOT EXISTS presets (type TEXT, name TEXT, data TEXT, edited INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (type, name))")
+				connection.execute("CREATE TABLE IF NOT EXISTS imports (file TEXT PRIMARY KEY, fingerprint TEXT)")
+				if "edited" not in [row[1] for row in connection.execute("PRAGMA table_info(presets)")]:
+					connection.execute("ALTER TABLE presets ADD COLUMN edited INTEGER NOT NULL DEFAULT 0")
+			self.Import()
+		return self.connection
+
+	@contextlib.contextmanager
+	def Transaction(self):
+		"""Runs the statements in the with block as one transaction, which waits for any other process writing to the database first
+		"""
+		connection = self.Connect()
+		connection.execute("BEGIN IMMEDIATE")
+		try:
+			yield connection
+		except BaseException:
+			connection.execute("ROLLBACK")
+			raise
+		connection.execute("COMMIT")
+
+	def Import(self) -> None:
+		"""Copies every preset in presetFile into the database if the file has changed since it was last imported. 
+		Presets of the same name are replaced, unless they were saved to the database after it was last exported.
+		"""
+		if self.presetFile == None or not os.path.isfile(self.presetFile):
+			return
+		path = os.path.abspath(self.presetFile)
+		with self.Transaction() as connection:
+			fingerprint = json.dumps(FileFingerprint(path))
+			row = connection.execute("SELECT fingerprint FROM imports WHERE file = ?", (path,)).fetchone()
+			if row != None and row[0] == fingerprint:
+				return
+			with open(path, encoding="utf-8") as file:
+				data = json.load(file)
+			connection.executemany("INSERT INTO presets (type, name, data) VALUES (?, ?, ?) ON CONFLICT (type, name) DO UPDATE SET data = excluded.data WHERE NOT edited",
+				[(self.presetType.__name__, name, json.dumps(values, ensure_ascii=False)) for name, values in data.items()])
+			connection.execute("INSERT INTO imports (file, fingerprint) VALUES (?, ?) ON CONFLICT (file) DO UPDATE SET fingerprint = excluded.fingerprint", (path, fingerprint))
+		log.debug("Imported %d preset(s) from %s", len(data), path)
+
+	def Save(self, preset: Preset) -> None:
+		"""Writes preset to the database, replacing any preset of the same name, without touching any other preset
+		"""
+		name = preset.values["name"].value
+		with self.Transaction() as connection:
+			connection.execute("INSERT INTO presets (type, name, data, edited) VALUES (?, ?, ?, 1) ON CONFLICT (type, name) DO UPDATE SET data = excluded.data, edited = 1",
+				(self.presetType.__name__, name, json.dumps(preset.getValues(), ensure_ascii=False)))
+		self.presets[name] = preset
+
+	def Add(self, preset: Preset) -> None:
+		"""Makes preset available until the program exits, without saving it
+		"""
+		self.presets[preset.values["name"].value] = preset
+
+	def Export(self, path: str = None) -> None:
+		"""Writes every preset in the database to a JSON preset file, in the format loadPresets reads. 
+		Once presetFile holds every preset saved to the database, editing it by hand replaces them again.
+
+		Args:
+			path (str, optional): The file to write. Defaults to presetFile.
+		"""
+		path = path or self.presetFile
+		with self.Transaction() as connection:
+			rows = connection.execute("SELECT name, data FROM presets WHERE type = ? ORDER BY rowid", (self.presetType.__name__,)).fetchall()
+			temp = f"{path}.{os.getpid()}.tmp"
+			with open(temp, "w", encoding="utf-8") as file:
+				json.dump({name: json.loads(data) for name, data in rows}, file, ensure_ascii=False, indent=4)
+			os.replace(temp, path)
+			if self.presetFile != None and os.path.abspath(path) == os.path.abspath(self.presetFile):
+				#The file now matches the database, so there is nothing to import from it
+				connection.execute("UPDATE presets SET edited = 0 WHERE type = ?", (self.presetType.__name__,))
+				connection.execute("INSERT INTO imports (file, fingerprint) VALUES (?, ?) ON CONFLICT (file) DO UPDATE SET fingerprint = excluded.fingerprint", 
+					(os.path.abspath(path), json.dumps(FileFingerprint(path))))
+
+	def __getitem__(self, name: str) -> Preset:
+		if name not in self.presets:
+			row = self.Connect().execute("SELECT data FROM presets WHERE type = ? AND name = ?", (self.presetType.__name__, name)).fetchone()
+			if row == None:
+				raise KeyError(name)
+			self.presets[name] = self.presetType(**json.loads(row[0]))
+		return self.presets[name]
+
+	def get(self, name: str, default: Preset = None) -> Preset | None:
+		try:
+			return self[name]
+		except KeyError:
+			return default
+
+	def __contains__(self, name: str) -> bool:
+		return name in self.presets or self.Connect().execute("SELECT 1 FROM presets WHERE type = ? AND name = ?", (self.presetType.__name__, name)).fetchone() != None
+
+	def keys(self) -> list[str]:
+		names = [row[0] for row in self.Connect().execute("SELECT name FROM presets WHERE type = ? ORDER BY rowid", (self.presetType.__name__,))]
+		return names + [x for x in self.presets if x not in names]
+
+	def values(self) -> list[Preset]:
+		return [self[x] for x in self.keys()]
+
+	def __iter__(self):
+		return iter(self.keys())
+
+	def __len__(self) -> int:
+		return len(self.keys())
+
 # https://stackoverflow.com/a/56253636/13351405
 def legend_without_duplicate_labels(axs):
 	all_unique = []
@@ -799,13 +1922,8 @@ def plot(axisPreset, subplotPreset, figurePreset, pictureName, title, suptitle,
 	else:
 		plt.subplots_adjust(wspace=0.1, hspace=0.1)
 	for index, axes in enumerate(axs):
-		print(f"Working on plot {index + 1}")
-		if axisPreset.values["palette"].value == [""]:
-			ax = sns.lineplot(data = dataPlots[index], x = "index", y = "value", dashes = False, hue = "variable", ax = axes)
-			ax.legend_.remove()
-		else:
-			ax = sns.lineplot(data = dataPlots[index], x = "index", y = "value", dashes = False, hue = "variable", palette = axisPreset.values["palette"].value, ax = axes)
-			ax.legend_.remove()
+		log.debug("Working on plot %d", index + 1)
+		ax = drawLines(axisPreset, axes, subplotLines(axisPreset, dataPlots[index]))
 		axes.set(xlabel = axisPreset.values["xAxisTitle"].value, ylabel = axisPreset.values["yAxisTitle"].value)
 		if subplotTitles != []:
 			axes.set_title(subplotTitles[index], fontsize="small", alpha=0.8, ha="center", x = 0.5)
@@ -825,19 +1943,53 @@ def plot(axisPreset, subplotPreset, figurePreset, pictureName, title, suptitle,
 	fig.legend(*legend_without_duplicate_labels(axs), borderaxespad = 0, bbox_to_anchor = (0.5, 0), ncol = 3, loc = "upper center", edgecolor = "white", framealpha = 0)
 	fig.savefig(pictureName, bbox_inches = "tight", dpi = 500)
 
+def drawLines(axisPreset, ax, lines: list[tuple[str, np.ndarray, np.ndarray]]):
+	"""Draws each line with the backend chosen by the preset, colored by its palette, without a legend
+
+	Args:
+		lines (list[tuple[str, np.ndarray, np.ndarray]]): The name, x values, and y values of each line
+
+	Returns:
+		matplotlib.axes.Axes: The axes the lines were drawn on
+	"""
+	palette = axisPreset.values["palette"].value
+	if axisPreset.values["lineBackend"].value == "seaborn":
+		#seaborn needs the data in long format
+		with instrumentation.Stage("melt"):
+			dataPlots = SubplotData([Series(name, x, y[:, np.newaxis]) for name, x, y in lines]).AsLongFormat()
+		if palette == [""]:
+			ax = sns.lineplot(data = dataPlots, x = "index", y = "value", dashes = False, hue = "variable", ax = ax)
+		else:
+			ax = sns.lineplot(data = dataPlots, x = "index", y = "value", dashes = False, hue = "variable", palette = palette, ax = ax)
+		#Seaborn draws no legend when every series is empty
+		if ax.legend_:
+			ax.legend_.remove()
+		return ax
+
+	#Each line is drawn straight from its values, with colors assigned in order, the same way seaborn assigns them
+	colors = sns.color_palette(n_colors = len(lines)) if palette in [[""], []] else palette
+	for index, (name, x, y) in enumerate(lines):
+		ax.plot(x, y, color = colors[index % len(colors)], label = name)
+	return ax
+
+def subplotLines(axisPreset, dataPlots: SubplotData) -> list[tuple[str, np.ndarray, np.ndarray]]:
+	"""Returns the line drawn for each series in the subplot, which is its first column, downsampled if the preset asks for it. 
+	A series with no values, such as one whose rows all lie outside xLimit, is an empty line.
+	"""
+	lines = []
+	for x in dataPlots:
+		y = x.values[:, 0] if x.values.shape[1] else np.empty(0)
+		if axisPreset.values["downsample"].value:
+			keep = DownsampleIndices(y, axisPreset.values["downsample"].value)
+			lines.append((x.name, x.x[keep], y[keep]))
+		else:
+			lines.append((x.name, x.x, y))
+	return lines
+
 def linePlot(axisPreset, ax, title, dataPlots):
 	ax.set_title(title)
 	# print(f"Working on plot {index + 1}")
-	print(dataPlots)
-	dataPlots["value"] = dataPlots["value"].apply(lambda x: x[0] if type(x) == list else x)
-	# dataPlots["value"] = dataPlots["value"].apply(lambda x: x[0] if type(x) == list and len(x) > 0 else (None if len(x) == 0 else x))
-	print(dataPlots)
-	if axisPreset.values["palette"].value == [""]:
-		ax = sns.lineplot(data = dataPlots, x = "index", y = "value", dashes = False, hue = "variable", ax = ax)
-		ax.legend_.remove()
-	else:
-		ax = sns.lineplot(data = dataPlots, x = "index", y = "value", dashes = False, hue = "variable", palette = axisPreset.values["palette"].value, ax = ax)
-		ax.legend_.remove()
+	ax = drawLines(axisPreset, ax, subplotLines(axisPreset, dataPlots))
 	ax.grid(visible = True, color = "#D9D9D9")
 	ax.set(xlabel = axisPreset.values["xAxisTitle"].value, ylabel = axisPreset.values["yAxisTitle"].value)
 	if axisPreset.values["xLimit"].value != None:
@@ -857,9 +2009,12 @@ def linePlot(axisPreset, ax, title, dataPlots):
 
 def scatterPlot(axisPreset, ax, title, dataPlots):
 	ax.set_title(title)
-	for index in range(len(dataPlots.iloc[0]["value"])):
-		# idk = ax.scatter(x=dataPlots["index"], y=dataPlots["value"].apply(lambda x: x[index]), cmap=axisPreset.values["color"].value[0], c=list(range(len(dataPlots["index"]) + 1, 1, -1)))
-		ax.scatter(x=dataPlots["index"], y=dataPlots["value"].apply(lambda x: x[index]), cmap=axisPreset.values["color"].value[0], c=list(range(len(dataPlots["index"]) + 1, 1, -1)))
+	#Each column is drawn as one set of points, across every series
+	for index in range(max([x.values.shape[1] for x in dataPlots], default=0)):
+		currColumn = [series for series in dataPlots if index < series.values.shape[1]]
+		x = np.concatenate([series.x for series in currColumn])
+		y = np.concatenate([series.values[:, index] for series in currColumn])
+		ax.scatter(x=x, y=y, cmap=axisPreset.values["color"].value[0], c=np.arange(len(x) + 1, 1, -1), rasterized=axisPreset.values["rasterize"].value)
 	ax.set_xlabel(axisPreset.values["xAxisTitle"].value)
 	ax.set_ylabel(axisPreset.values["yAxisTitle"].value)
 	if axisPreset.values["xLimit"].value != None:
@@ -879,18 +2034,51 @@ def scatterPlot(axisPreset, ax, title, dataPlots):
 	ax.grid(visible=True, which="minor", axis="both")
 	# ax.grid(visible=True, which="major", axis="both", color="black", lw=2)
 	ax.grid(visible=True, which="major", axis="both")
-	ax.yaxis.set_minor_formatter(FormatStrFormatter("%.0f"))
-	ax.xaxis.set_minor_formatter(FormatStrFormatter("%.0f"))
+	ax.yaxis.set_minor_formatter(ticker.FormatStrFormatter("%.0f"))
+	ax.xaxis.set_minor_formatter(ticker.FormatStrFormatter("%.0f"))
 	ax.set_axisbelow(True)
 	# ax.legend([idk, (idk)], ["data"], scatterpoints = 3)
 
-def ramachandranPlot(axisPreset, ax, title, dataPlots, ns):
+def ramachandranPoints(dataPlots, variable, ns) -> tuple[np.ndarray, np.ndarray]:
+	"""Returns the phi and psi angles of variable for nanosecond ns
+	"""
+	frame = dataPlots.Get(variable).Frame(ns)
+	return frame[:, 0], frame[:, 1]
+
+def ramachandranHistogram(axisPreset, x, y) -> tuple[np.ma.MaskedArray, np.ndarray, np.ndarray]:
+	"""Counts the points in each cell of a gridSize × gridSize grid covering the plot's limits, or every angle if there are no limits
+
+	Returns:
+		tuple[np.ma.MaskedArray, np.ndarray, np.ndarray]: The counts, with empty cells masked so they aren't colored, and the edges of the cells along each axis
+	"""
+	xRange = sorted(axisPreset.values["xLimit"].value) if axisPreset.values["xLimit"].value else [-180, 180]
+	yRange = sorted(axisPreset.values["yLimit"].value) if axisPreset.values["yLimit"].value else [-180, 180]
+	counts, xEdges, yEdges = np.histogram2d(x, y, bins=axisPreset.values["gridSize"].value, range=[xRange, yRange])
+	#pcolormesh expects rows to be y values
+	return np.ma.masked_equal(counts.T, 0), xEdges, yEdges
+
+def ramachandranPlot(axisPreset, ax, title, dataPlots, ns) -> list[tuple[str, mpl.collections.Collection]]:
+	"""Draws the Ramachandran plot for nanosecond ns, as points or as a density map depending on the preset
+
+	Returns:
+		list[tuple[str, mpl.collections.Collection]]: Each variable, and the points or cells drawn for it
+	"""
 	ax.set_title(title)
-	for index, variable in enumerate(list(dict.fromkeys(list(dataPlots["variable"])))):
-		currVariable = np.where(dataPlots["variable"] == variable)
-		x = dataPlots.iloc[currVariable[0]]["value"].apply(lambda x: x[2 * ns] if type(x) == list else x)
-		y = dataPlots.iloc[currVariable[0]]["value"].apply(lambda x: x[2 * ns + 1] if type(x) == list else x)
-		ax.scatter(x=x, y=y, cmap=axisPreset.values["color"].value[index], c=list(range(len(dataPlots.iloc[currVariable[0]]["value"]) + 1, 1, -1)))
+	scatters = []
+	rasterize = axisPreset.values["rasterize"].value
+	for index, variable in enumerate([x.name for x in dataPlots]):
+		x, y = ramachandranPoints(dataPlots, variable, ns)
+		match axisPreset.values["density"].value:
+			case "hexbin":
+				xRange = sorted(axisPreset.values["xLimit"].value) if axisPreset.values["xLimit"].value else [-180, 180]
+				yRange = sorted(axisPreset.values["yLimit"].value) if axisPreset.values["yLimit"].value else [-180, 180]
+				artist = ax.hexbin(x, y, gridsize=axisPreset.values["gridSize"].value, extent=xRange + yRange, mincnt=1, cmap=axisPreset.values["color"].value[index], rasterized=rasterize)
+			case "histogram":
+				counts, xEdges, yEdges = ramachandranHistogram(axisPreset, x, y)
+				artist = ax.pcolormesh(xEdges, yEdges, counts, cmap=axisPreset.values["color"].value[index], rasterized=rasterize)
+			case _:
+				artist = ax.scatter(x=x, y=y, cmap=axisPreset.values["color"].value[index], c=np.arange(len(x) + 1, 1, -1), rasterized=rasterize)
+		scatters.append((variable, artist))
 	ax.set_xlabel(axisPreset.values["xAxisTitle"].value)
 	ax.set_ylabel(axisPreset.values["yAxisTitle"].value)
 	if axisPreset.values["xLimit"].value != None:
@@ -910,10 +2098,11 @@ def ramachandranPlot(axisPreset, ax, title, dataPlots, ns):
 	ax.grid(visible=True, which="minor", axis="both")
 	ax.grid(visible=True, which="major", axis="both", color="black", lw=2)
 	# ax.grid(visible=True, which="major", axis="both")
-	ax.yaxis.set_minor_formatter(FormatStrFormatter("%.0f"))
-	ax.xaxis.set_minor_formatter(FormatStrFormatter("%.0f"))
+	ax.yaxis.set_minor_formatter(ticker.FormatStrFormatter("%.0f"))
+	ax.xaxis.set_minor_formatter(ticker.FormatStrFormatter("%.0f"))
 	ax.set_axisbelow(True)
 	# ax.legend([idk, (idk)], ["data"], scatterpoints = 3)
+	return scatters
 
 def gradientPlot(axisPreset, ax):
 	gradient = np.linspace(1000, 2, 1000)
@@ -935,82 +2124,680 @@ def getStartEndOffset(axisPresetList):
 				indexOffset = j.values["indexOffset"].value
 	return (start, end, indexOffset)
 
-def plotHelper(axisPresetList, subplotPresetList, figurePreset, pictureName, title, dataPlots, subfigureTitles, subplotTitles):
+"""Wherever this appears in the picture name or a title, it is replaced with the current nanosecond"""
+FrameFlag = "!#!#"
+
+def buildFigure(ns, axisPresetList, subplotPresetList, figurePreset, title, dataPlots, subfigureTitles, subplotTitles, offset):
+	"""Builds the complete figure for a single nanosecond
+
+	Returns:
+		tuple: The figure, each title as (Text, the title before the nanosecond was substituted), 
+			and each set of Ramachandran points as (Collection, its data, its variable, its AxisPreset)
+	"""
+	flag = FrameFlag
+	titles = []
+	scatters = []
+	fig = plt.figure(layout='constrained', figsize=(figurePreset.values["width"].value, figurePreset.values["height"].value))
+	fig.subplots_adjust(hspace=0.4, top=0.925, bottom=0.1)
+	titles.append((fig.suptitle(title.replace(flag, str(ns)), fontsize=20), title))
+	
+	subfigs = fig.subfigures(figurePreset.values["rows"].value, figurePreset.values["cols"].value, 
+			height_ratios=figurePreset.values["heightRatios"].value, width_ratios=figurePreset.values["widthRatios"].value, 
+			hspace = 0.01, wspace = 0.01)
+
+	# The fig.subfigures method is very annoying; sometimes it's type np.ndarray sometimes it isn't
+	if type(subfigs) != np.ndarray:
+		subfigs = np.ndarray(shape=(1,), buffer=np.array([subfigs]), dtype=mpl.figure.SubFigure)
+
+	# Loops though all the subfigures
+	for i, subfig in enumerate(subfigs):
+		if i+1 <= figurePreset.values["numSubFigures"].value:
+			titles.append((subfig.suptitle(subfigureTitles[i].replace(flag, str(ns))), subfigureTitles[i]))
+			axes = subfig.subplots(subplotPresetList[i].values["rows"].value, subplotPresetList[i].values["cols"].value, 
+				height_ratios = subplotPresetList[i].values["heightRatios"].value, width_ratios = subplotPresetList[i].values["widthRatios"].value,
+				sharex = subplotPresetList[i].values["shareX"].value, sharey = subplotPresetList[i].values["shareY"].value)
+			
+			if type(axes) == np.ndarray:
+				axes = axes.flatten()
+			else:
+				axes = np.ndarray(shape=(1,), dtype=mpl.axes.Axes, buffer=np.array([axes]))
+			
+			# Loops though all the subplots
+			for j, ax in enumerate(axes):
+				if j+1 <= subplotPresetList[i].values["numSubPlots"].value:
+					log.debug("Working on plot %d", j + 1)
+					match axisPresetList[i][j].values["type"].value:
+						case "line":
+							linePlot(axisPresetList[i][j], ax, subplotTitles[i][j], dataPlots[i][j])
+						case "scatter":
+							scatterPlot(axisPresetList[i][j], ax, subplotTitles[i][j], dataPlots[i][j])
+						case "Ramachandran":
+							for variable, collection in ramachandranPlot(axisPresetList[i][j], ax, subplotTitles[i][j], dataPlots[i][j], ns - offset):
+								scatters.append((collection, dataPlots[i][j], variable, axisPresetList[i][j]))
+						case "gradient":
+							gradientPlot(axisPresetList[i][j], ax)
+				else:
+					subfig.delaxes(ax)
+			# subfig.legend(*legend_without_duplicate_labels(axes), borderaxespad = 0, ncol = 1, loc='center left', bbox_to_anchor=(1, 0.5), edgecolor = "white", framealpha = 0, scatterpoints=3)
+			subfig.legend(*legend_without_duplicate_labels(axes), borderaxespad = 0, bbox_to_anchor = (0.5, 0), ncol = 3, loc = "upper center", edgecolor = "white", framealpha = 0, scatterpoints=3)
+		else:
+			#remove subfigure
+			pass
+
+	return fig, titles, scatters
+
+def writePicture(path: str, pixels: np.ndarray, format: str, dpi: int, options: dict, ns: int, then: Callable = None) -> None:
+	"""Encodes pixels and writes them to path, exactly as savefig would have, then calls then. Run by imageWriter on a background thread.
+
+	Args:
+		path (str): Where to save the picture
+		pixels (np.ndarray): The RGBA pixels of the picture, top row first
+		format (str): One of PixelFormats
+		dpi (int): The resolution recorded in the picture
+		options (dict): Passed on to Pillow, such as compress_level or quality
+		ns (int): The nanosecond of the picture, recorded by instrumentation
+		then (Callable, optional): Called once the picture has been written. Defaults to None.
+	"""
+	from PIL import Image
+	with instrumentation.Stage("encode", frame = ns):
+		if format in ["jpeg", "jpg"]:
+			#JPEG has no transparency, savefig blends the pixels onto white first
+			image = Image.fromarray(pixels, "RGBA")
+			background = Image.new("RGB", image.size, (255, 255, 255))
+			background.paste(image, image)
+			pixels = np.asarray(background)
+		#Writing to a temporary file first means no one ever sees a half-written picture
+		temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+		mpl.image.imsave(temp, pixels, format = format, dpi = dpi, pil_kwargs = options)
+		os.replace(temp, path)
+	if then != None:
+		then()
+
+class PixelBuffer(io.BytesIO):
+	"""The file savefig(format="rgba") writes to, which keeps the shape of the canvas it was drawn on, since that is rounded from the size of the saved area in ways that are hard to repeat exactly
+	"""
+	def write(self, data) -> int:
+		self.shape = memoryview(data).shape
+		return super().write(data)
+
+class PictureOutput:
+	"""Saves the frames of a figure with the dpi, format, and compression of its FigurePreset.
+	Pictures in PixelFormats are drawn to RGBA pixels in memory, which are handed to imageWriter to be encoded and written in the background while the next frame is drawn.
+	"""
+	def __init__(self, figurePreset: FigurePreset) -> None:
+		self.dpi = figurePreset.values["dpi"].value
+		self.compression = figurePreset.values["compression"].value
+		self.quality = figurePreset.values["quality"].value
+		self.reuseBbox = figurePreset.values["reuseBbox"].value
+		self.bbox = None
+
+	def TightBbox(self, fig):
+		"""Returns the area of fig that savefig(bbox_inches="tight") would save, in inches. With reuseBbox, it is only calculated for the first frame.
+		It is calculated at the dpi the picture is saved with, since text is measured slightly differently at other resolutions.
+		"""
+		if self.bbox != None:
+			return self.bbox
+		dpi = fig.dpi
+		fig.set_dpi(self.dpi)
+		try:
+			fig.draw_without_rendering()
+			bbox = fig.get_tightbbox().padded(mpl.rcParams["savefig.pad_inches"])
+		finally:
+			fig.set_dpi(dpi)
+		if self.reuseBbox:
+			self.bbox = bbox
+		return bbox
+
+	def Save(self, fig, path: str, ns: int, then: Callable = None) -> None:
+		"""Saves fig to path, calling then once it has been written
+
+		Args:
+			fig (matplotlib.figure.Figure): The figure to save
+			path (str): Where to save it, its extension determines the format
+			ns (int): The nanosecond of the picture, recorded by instrumentation
+			then (Callable, optional): Called once the picture has been written, which may be after this returns. Defaults to None.
+		"""
+		bbox = self.TightBbox(fig)
+		format = os.path.splitext(path)[1][1:].lower()
+		if format not in PixelFormats:
+			fig.savefig(path, bbox_inches = bbox, dpi = self.dpi)
+			if then != None:
+				then()
+			return
+		buffer = PixelBuffer()
+		fig.savefig(buffer, format = "rgba", bbox_inches = bbox, dpi = self.dpi)
+		pixels = np.frombuffer(buffer.getbuffer(), np.uint8).reshape(buffer.shape)
+		if format == "png":
+			options = {"compress_level": self.compression}
+		else:
+			options = {"quality": self.quality} if self.quality else {}
+		imageWriter.Submit(writePicture, path, pixels, format, self.dpi, options, ns, then)
+
+def picturePath(pictureName: str, figurePreset: FigurePreset) -> str:
+	"""Returns pictureName with the extension of the format chosen by figurePreset, or with matplotlib's default format if it has no extension and no format was chosen
+	"""
+	format = figurePreset.values["format"].value
+	if format:
+		return f"{os.path.splitext(pictureName)[0]}.{format}"
+	if not os.path.splitext(pictureName)[1]:
+		return f"{pictureName}.{mpl.rcParams['savefig.format']}"
+	return pictureName
+
+def renderFrame(ns, axisPresetList, subplotPresetList, figurePreset, pictureName, title, dataPlots, subfigureTitles, subplotTitles, offset, output: PictureOutput = None, then: Callable = None):
+	"""Builds, draws, and saves the complete figure for a single nanosecond. 
+	The picture is saved by output, or a new PictureOutput if it is None, and then is called once it has been written.
+	"""
+	with instrumentation.Stage("draw", frame = ns):
+		fig, _, _ = buildFigure(ns, axisPresetList, subplotPresetList, figurePreset, title, dataPlots, subfigureTitles, subplotTitles, offset)
+	with instrumentation.Stage("savefig", frame = ns):
+		(output or PictureOutput(figurePreset)).Save(fig, pictureName.replace(FrameFlag, str(ns)), ns, then)
+	plt.close(fig)
+
+class FrameTemplate:
+	"""A figure that is built once and reused for every nanosecond. 
+	Only the Ramachandran points and the titles change from one nanosecond to the next, so rather than building a new figure each time, those artists are updated in place.
+	"""
+	def __init__(self, ns, axisPresetList, subplotPresetList, figurePreset, pictureName, title, dataPlots, subfigureTitles, subplotTitles, offset) -> None:
+		"""Builds the figure for nanosecond ns, taking the same arguments as renderFrame
+		"""
+		with instrumentation.Stage("draw", frame = ns):
+			self.fig, self.titles, self.scatters = buildFigure(ns, axisPresetList, subplotPresetList, figurePreset, title, dataPlots, subfigureTitles, subplotTitles, offset)
+		self.pictureName = pictureName
+		self.offset = offset
+		self.output = PictureOutput(figurePreset)
+
+	@staticmethod
+	def CanReuse(axisPresetList) -> bool:
+		"""A figure can only be reused if nothing but the points depend on the data, 
+		so every Ramachandran plot needs fixed limits, otherwise they would have to be recalculated from each nanosecond's points.
+		Hexbin plots can't be reused either, since only the cells that hold points are drawn.
+		"""
+		return all(x.values["xLimit"].value and x.values["yLimit"].value and x.values["density"].value != "hexbin" 
+			for row in axisPresetList for x in row if x.values["type"].value == "Ramachandran")
+
+	def Update(self, ns) -> None:
+		"""Moves the points and changes the titles to those of nanosecond ns
+		"""
+		with instrumentation.Stage("draw", frame = ns):
+			for text, template in self.titles:
+				text.set_text(template.replace(FrameFlag, str(ns)))
+			for collection, dataPlots, variable, axisPreset in self.scatters:
+				x, y = ramachandranPoints(dataPlots, variable, ns - self.offset)
+				if isinstance(collection, mpl.collections.QuadMesh):
+					collection.set_array(ramachandranHistogram(axisPreset, x, y)[0])
+					collection.autoscale()
+				else:
+					collection.set_offsets(np.column_stack((x, y)))
+
+	def Render(self, ns, then: Callable = None) -> None:
+		"""Updates the figure to nanosecond ns and saves it, calling then once it has been written
+		"""
+		self.Update(ns)
+		with instrumentation.Stage("savefig", frame = ns):
+			self.output.Save(self.fig, self.pictureName.replace(FrameFlag, str(ns)), ns, then)
+
+	def Close(self) -> None:
+		plt.close(self.fig)
+
+def renderKey(state: dict, series: list[list[list[tuple[str, str]]]]) -> str:
+	"""Returns a key that changes whenever anything a picture is drawn from changes: the values of every preset, the titles, the name of every series, and the data files they were read from.
+	The key of each frame is this key followed by the frame's nanosecond.
+
+	Args:
+		state (dict): The arguments to renderFrame other than ns, dataPlots isn't used so it may not be loaded yet
+		series (list[list[list[tuple[str, str]]]]): The name of each series in each subplot of each subfigure, and the path of the file it is read from
+
+	Returns:
+		str: The key
+	"""
+	description = {
+		"version": buildManifest.version,
+		"figure": state["figurePreset"].getValues(),
+		"subplots": [x.getValues() for x in state["subplotPresetList"]],
+		#startNs and endNs only choose which frames are rendered, not what is drawn in them
+		"axes": [[{name: value for name, value in x.getValues().items() if name not in ("startNs", "endNs")} for x in row] for row in state["axisPresetList"]],
+		"titles": [state["title"], state["subfigureTitles"], state["subplotTitles"]],
+		"offset": state["offset"],
+		"series": [[[[name, FileFingerprint(path) if path != None else None] for name, path in subplot] for subplot in row] for row in series],
+	}
+	return hashlib.sha1(json.dumps(description, sort_keys = True, default = str).encode()).hexdigest()
+
+"""Animations with these extensions are encoded by ffmpeg, any other extension is written by Pillow (.gif, .png, .webp)"""
+FFMpegFormats = [".mp4", ".mkv", ".mov", ".avi"]
+
+def animateFrames(frames: list[int], path: str, fps: int, dpi: int, state: dict) -> None:
+	"""Renders every frame into a single animation instead of one picture per frame. 
+	A FrameTemplate is updated for each frame, and its pixels are handed straight to the animation writer.
+	ffmpeg encodes frames as they arrive, Pillow holds them in memory until the last one is drawn.
+
+	Args:
+		frames (list[int]): The nanoseconds to render, in order
+		path (str): Where to save the animation, its extension determines the format
+		fps (int): The number of frames per second
+		dpi (int): The resolution of each frame
+		state (dict): The arguments to renderFrame other than ns
+	"""
+	if os.path.splitext(path)[1].lower() in FFMpegFormats:
+		if not animation.FFMpegWriter.isAvailable():
+			raise RuntimeError(f"ffmpeg must be installed to save {path}.")
+		writer = animation.FFMpegWriter(fps = fps)
+	else:
+		writer = animation.PillowWriter(fps = fps)
+
+	template = FrameTemplate(int(frames[0]), **state)
+	with writer.saving(template.fig, path, dpi):
+		for ns in frames:
+			template.Update(int(ns))
+			with instrumentation.Stage("encode", frame = int(ns)):
+				writer.grab_frame()
+	template.Close()
+
+"""The arguments to renderFrame shared by every frame a rendering process draws, set once per process by setRenderState"""
+renderState = {}
+
+def setRenderState(state: dict, rcParams: dict, manifest: BuildManifest, writer: ImageWriter) -> None:
+	"""Prepares a process from the pool in plotHelper to render frames
+
+	Args:
+		state (dict): The arguments to renderFrame other than ns
+		rcParams (dict): The matplotlib settings of the main process, so every frame is styled the same way
+		manifest (BuildManifest): The manifest used by the main process
+		writer (ImageWriter): The image writer used by the main process
+	"""
+	global renderState, buildManifest, imageWriter
+	mpl.use("Agg")
+	mpl.rcParams.update(rcParams)
+	renderState = state
+	buildManifest = manifest
+	imageWriter = writer
+
+def renderFrames(frames: list[int], reuse: bool = False, state: dict = None, key: str = None) -> None:
+	"""Renders a run of frames, either in a process from the pool in plotHelper, or in this process if state is given
+
+	Args:
+		frames (list[int]): The nanoseconds to render
+		reuse (bool, optional): Build the figure once with a FrameTemplate and update it for each frame. Defaults to False.
+		state (dict, optional): The arguments to renderFrame other than ns. Defaults to None, which uses renderState.
+		key (str, optional): The key from renderKey, each frame is recorded in buildManifest as soon as it is saved. Defaults to None, which records nothing.
+	"""
+	if state == None:
+		state = renderState
+	template = FrameTemplate(int(frames[0]), **state) if reuse and len(frames) > 1 else None
+	output = PictureOutput(state["figurePreset"])
+	for ns in frames:
+		ns = int(ns)
+		#Each frame is recorded once its picture has been written, which may be after the next frame is drawn
+		then = functools.partial(buildManifest.Record, state["pictureName"].replace(FrameFlag, str(ns)), f"{key}:{ns}") if key != None else None
+		if template != None:
+			template.Render(ns, then)
+		else:
+			renderFrame(ns, **state, output = output, then = then)
+	if template != None:
+		template.Close()
+	imageWriter.Wait()
+
+def datasetSeries(axisPresetList: list[list[AxisPreset]], datasets: list[list[list[Dataset]]]) -> list[list[list[tuple[str, str]]]]:
+	"""Returns the name of each series populateDatasets will make from datasets, and the path it is read from, for renderKey
+	"""
+	return [[[(name, x.path) for x in subplot for name in seriesNames(axisPresetList[index][j], x)] for j, subplot in enumerate(row)] for index, row in enumerate(datasets)]
+
+def renderPlan(axisPresetList, subplotPresetList, figurePreset, pictureName, title, series, subfigureTitles, subplotTitles, animationPath = None, fps = 10, animationDpi = 150) -> tuple[dict, str, list[int], int]:
+	"""Works out which pictures plotHelper has to render, or whether it has to render the animation, without reading any data
+
+	Args:
+		series (list[list[list[tuple[str, str]]]]): The name and path of each series, for renderKey
+		The rest are the arguments to plotHelper
+
+	Returns:
+		tuple[dict, str, list[int], int]: The arguments to renderFrame other than ns, with dataPlots left None, the key from renderKey, 
+			the nanoseconds to render, and how many nanoseconds are up to date
+	"""
 	start = 0
 	end = 1
 	offset = 0
-	flag = "!#!#"
 	# if any of the types of plots to be generated are Ramachandran
 	if reduce(lambda x: True if True in [y.values["type"].value == "Ramachandran" for y in x] else False, False, lambda x, y: x or y, axisPresetList):
 		start, end, offset = getStartEndOffset(axisPresetList)
-		print(offset)
-	
-	# loops though each of the nanoseconds, if the plot isn't Ramachandran this loop just executes once
-	for ns in range(start, end):
-		fig = plt.figure(layout='constrained', figsize=(figurePreset.values["width"].value, figurePreset.values["height"].value))
-		fig.subplots_adjust(hspace=0.4, top=0.925, bottom=0.1)
-		fig.suptitle(title.replace(flag, str(ns)), fontsize=20)
-		
-		subfigs = fig.subfigures(figurePreset.values["rows"].value, figurePreset.values["cols"].value, 
-				height_ratios=figurePreset.values["heightRatios"].value, width_ratios=figurePreset.values["widthRatios"].value, 
-				hspace = 0.01, wspace = 0.01)
-
-		# The fig.subfigures method is very annoying; sometimes it's type np.ndarray sometimes it isn't
-		if type(subfigs) != np.ndarray:
-			subfigs = np.ndarray(shape=(1,), buffer=np.array([subfigs]), dtype=mpl.figure.SubFigure)
-
-		# Loops though all the subfigures
-		for i, subfig in enumerate(subfigs):
-			if i+1 <= figurePreset.values["numSubFigures"].value:
-				subfig.suptitle(subfigureTitles[i].replace(flag, str(ns)))
-				axes = subfig.subplots(subplotPresetList[i].values["rows"].value, subplotPresetList[i].values["cols"].value, 
-					height_ratios = subplotPresetList[i].values["heightRatios"].value, width_ratios = subplotPresetList[i].values["widthRatios"].value,
-					sharex = subplotPresetList[i].values["shareX"].value, sharey = subplotPresetList[i].values["shareY"].value)
-				
-				if type(axes) == np.ndarray:
-					axes = axes.flatten()
-				else:
-					axes = np.ndarray(shape=(1,), dtype=mpl.axes.Axes, buffer=np.array([axes]))
-				
-				# Loops though all the subplots
-				for j, ax in enumerate(axes):
-					if j+1 <= subplotPresetList[i].values["numSubPlots"].value:
-						print(f"Working on plot {j + 1}")
-						match axisPresetList[i][j].values["type"].value:
-							case "line":
-								linePlot(axisPresetList[i][j], ax, subplotTitles[i][j], dataPlots[i][j])
-							case "scatter":
-								scatterPlot(axisPresetList[i][j], ax, subplotTitles[i][j], dataPlots[i][j])
-							case "Ramachandran":
-								ramachandranPlot(axisPresetList[i][j], ax, subplotTitles[i][j], dataPlots[i][j], ns - offset)
-							case "gradient":
-								gradientPlot(axisPresetList[i][j], ax)
-					else:
-						subfig.delaxes(ax)
-				# subfig.legend(*legend_without_duplicate_labels(axes), borderaxespad = 0, ncol = 1, loc='center left', bbox_to_anchor=(1, 0.5), edgecolor = "white", framealpha = 0, scatterpoints=3)
-				subfig.legend(*legend_without_duplicate_labels(axes), borderaxespad = 0, bbox_to_anchor = (0.5, 0), ncol = 3, loc = "upper center", edgecolor = "white", framealpha = 0, scatterpoints=3)
+		log.debug("Nanosecond offset %d", offset)
+
+	pictureName = picturePath(pictureName, figurePreset)
+	state = {"axisPresetList": axisPresetList, "subplotPresetList": subplotPresetList, "figurePreset": figurePreset, "pictureName": pictureName, "title": title,
+		"dataPlots": None, "subfigureTitles": subfigureTitles, "subplotTitles": subplotTitles, "offset": offset}
+	key = renderKey(state, series)
+
+	if animationPath != None:
+		key = f"{key}:{start}-{end}:{fps}:{animationDpi}"
+		frames = [] if buildManifest.IsCurrent(animationPath, key) else list(range(start, end))
+	else:
+		# Only the nanoseconds whose pictures are missing or out of date are rendered, if the plot isn't Ramachandran there is just one
+		frames = [ns for ns in range(start, end) if not buildManifest.IsCurrent(pictureName.replace(FrameFlag, str(ns)), f"{key}:{ns}")]
+	return state, key, frames, end - start - len(frames)
+
+def plotHelper(axisPresetList, subplotPresetList, figurePreset, pictureName, title, dataPlots, subfigureTitles, subplotTitles, jobs = 1, reuse = True, animationPath = None, fps = 10, animationDpi = 150, datasets = None):
+	"""Renders every picture, or the animation, that is out of date.
+	dataPlots may be None, in which case datasets (from collectDatasets) are only loaded once a picture is found to be out of date, so an unchanged figure reads no data.
+	"""
+	if animationPath != None and not FrameTemplate.CanReuse(axisPresetList):
+		raise ValueError("Every Ramachandran plot needs an xLimit and a yLimit, and can't use hexbin, to be animated.")
+	if dataPlots != None:
+		series = [[[(x.name, x.path) for x in subplot] for subplot in row] for row in dataPlots]
+	else:
+		series = datasetSeries(axisPresetList, datasets)
+	state, key, frames, current = renderPlan(axisPresetList, subplotPresetList, figurePreset, pictureName, title, series, subfigureTitles, subplotTitles, animationPath, fps, animationDpi)
+	if current:
+		if animationPath != None:
+			log.info("%s is up to date.", animationPath)
+		else:
+			log.info("Skipping %d picture(s) that are up to date.", current)
+	if not frames:
+		return
+	state["dataPlots"] = dataPlots if dataPlots != None else populateDatasets(axisPresetList, [len(x) for x in axisPresetList], subplotTitles, jobs, datasets = datasets)
+
+	if animationPath != None:
+		animateFrames(frames, animationPath, fps, animationDpi, state)
+		buildManifest.Record(animationPath, key)
+		return
+
+	reuse = reuse and FrameTemplate.CanReuse(axisPresetList)
+	jobs = min(jobs, len(frames))
+	if jobs <= 1:
+		renderFrames(frames, reuse, state, key)
+		return
+
+	# Each process renders one contiguous run of nanoseconds. Forking lets the processes share the loaded data instead of each receiving a copy.
+	context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+	with ProcessPoolExecutor(max_workers = jobs, mp_context = context, initializer = setRenderState, initargs = (state, mpl.rcParams.copy(), buildManifest, imageWriter)) as pool:
+		for _, records in pool.map(functools.partial(collectRecords, functools.partial(renderFrames, reuse = reuse, key = key)), np.array_split(np.array(frames), jobs)):
+			instrumentation.records += records
+
+def loadJobs(path: str) -> list[dict]:
+	"""Reads the figures to render from a job file, or from every job file in a directory, in alphabetical order.
+
+	A job file is JSON (or YAML, if PyYAML is installed) holding one job, a list of jobs, or {"jobs": [...]}. Each job looks like:
+		{
+			"figure": "One", "subplots": ["Two"], "axes": [["RMSD", "RMSD"]],
+			"pictureName": "RMSD.png", "title": "RMSD", "subfigureTitles": [""], "subplotTitles": [["WT", "Y220C"]],
+			"datasets": [[[{"name": "WT", "path": "wt.dat"}], [{"name": "Y220C", "path": "y220c.dat"}]]]
+		}
+	with one entry in subplots per subfigure, and one entry in axes, subplotTitles, and datasets per subplot of each subfigure.
+	Relative paths in pictureName and datasets are relative to the job file.
+
+	Args:
+		path (str): A job file, or a directory of job files
+
+	Returns:
+		list[dict]: Every job, each with a "name" identifying where it came from
+	"""
+	if os.path.isdir(path):
+		files = sorted(os.path.join(path, x) for x in os.listdir(path) if os.path.splitext(x)[1].lower() in [".json", ".yaml", ".yml"])
+	else:
+		files = [path]
+
+	jobs = []
+	for file in files:
+		with open(file, encoding="utf-8") as f:
+			if os.path.splitext(file)[1].lower() in [".yaml", ".yml"]:
+				try:
+					import yaml
+				except ImportError:
+					raise ImportError(f"PyYAML must be installed to read {file}, or the job can be written as JSON.")
+				contents = yaml.safe_load(f)
 			else:
-				#remove subfigure
-				pass
+				contents = json.load(f)
+		if type(contents) == dict:
+			contents = contents.get("jobs", [contents])
+
+		directory = os.path.dirname(os.path.abspath(file))
+		for index, job in enumerate(contents):
+			job = copy.deepcopy(job)
+			job.setdefault("name", f"{file} #{index + 1}" if len(contents) > 1 else file)
+			job["pictureName"] = os.path.join(directory, job["pictureName"])
+			for subfigure in job["datasets"]:
+				for subplot in subfigure:
+					for dataset in subplot:
+						dataset["path"] = os.path.join(directory, dataset["path"])
+			jobs.append(job)
+	return jobs
+
+def jobFigure(job: dict, FigurePresets: PresetStore, SubplotPresets: PresetStore, AxisPresets: PresetStore) -> dict:
+	"""Finds the presets a job from loadJobs uses and collects its datasets, without reading any data
 
-		fig.savefig(pictureName.replace(flag, str(ns)), bbox_inches = "tight", dpi = 500)
-			
+	Args:
+		job (dict): The job
+		FigurePresets (PresetStore): The figure presets
+		SubplotPresets (PresetStore): The subplot presets
+		AxisPresets (PresetStore): The axis presets
+
+	Returns:
+		dict: The arguments to plotHelper that describe the figure
+	"""
+	def find(Presets, name, kind):
+		if name not in Presets:
+			raise ValueError(f"{job['name']}: there is no {kind} preset named {name}.")
+		return Presets[name]
+
+	figurePreset = find(FigurePresets, job["figure"], "figure")
+	subplotPresetList = [find(SubplotPresets, x, "subplot") for x in job["subplots"]]
+	axisPresetList = [[find(AxisPresets, x, "axis") for x in row] for row in job["axes"]]
+	if len(subplotPresetList) != figurePreset.values["numSubFigures"].value or len(axisPresetList) != len(subplotPresetList):
+		raise ValueError(f"{job['name']}: figure preset {job['figure']} needs {figurePreset.values['numSubFigures'].value} subplot preset(s), and one list of axis presets for each.")
+
+	numSubplots = [len(x) for x in axisPresetList]
+	subfigureTitles = job.get("subfigureTitles", [""] * len(numSubplots))
+	subplotTitles = job.get("subplotTitles", [[""] * x for x in numSubplots])
+	return {"axisPresetList": axisPresetList, "subplotPresetList": subplotPresetList, "figurePreset": figurePreset, "pictureName": job["pictureName"], "title": job.get("title", ""), 
+		"subfigureTitles": subfigureTitles, "subplotTitles": subplotTitles, "datasets": collectDatasets(axisPresetList, numSubplots, subplotTitles, job["datasets"])}
+
+def renderJob(job: dict, FigurePresets: PresetStore, SubplotPresets: PresetStore, AxisPresets: PresetStore, args: argparse.Namespace) -> None:
+	"""Renders one job from loadJobs without asking the user anything
+
+	Args:
+		job (dict): The job to render
+		FigurePresets (PresetStore): The figure presets
+		SubplotPresets (PresetStore): The subplot presets
+		AxisPresets (PresetStore): The axis presets
+		args (argparse.Namespace): The command line arguments, which control how the job is loaded and rendered
+	"""
+	plotHelper(dataPlots = None, **jobFigure(job, FigurePresets, SubplotPresets, AxisPresets), jobs = args.jobs, reuse = not args.no_reuse_figure, 
+		animationPath = args.animate, fps = args.fps, animationDpi = args.animate_dpi)
+
+"""The presets and arguments shared by every job a batch process renders, set once per process by setBatchState"""
+batchState = {}
+
+def setBatchState(presetStores: tuple[PresetStore, PresetStore, PresetStore], args: argparse.Namespace, cache: DataCache, manifest: BuildManifest, writer: ImageWriter, rcParams: dict) -> None:
+	"""Prepares a process from the pool in runBatch to render jobs. 
+	Each process opens its own connection to the preset database, and only constructs the presets its jobs use.
+
+	Args:
+		presetStores (tuple[PresetStore, PresetStore, PresetStore]): The figure, subplot, and axis presets
+		args (argparse.Namespace): The command line arguments
+		cache (DataCache): The cache used by the main process
+		manifest (BuildManifest): The manifest used by the main process
+		writer (ImageWriter): The image writer used by the main process
+		rcParams (dict): The matplotlib settings of the main process
+	"""
+	global batchState, dataCache, buildManifest, imageWriter
+	mpl.use("Agg")
+	mpl.rcParams.update(rcParams)
+	dataCache = cache
+	buildManifest = manifest
+	imageWriter = writer
+	#Each job already has a process to itself, so it shouldn't start any more
+	args = copy.copy(args)
+	args.jobs = 1
+	batchState = {"FigurePresets": presetStores[0], "SubplotPresets": presetStores[1], "AxisPresets": presetStores[2], "args": args}
+
+def runJob(job: dict) -> tuple[str, bool, str, float]:
+	"""Renders a job with the presets and arguments in batchState, catching any error so one failed job doesn't stop the rest
+
+	Returns:
+		tuple[str, bool, str, float]: The name of the job, whether it succeeded, the error if it didn't, and how many seconds it took
+	"""
+	start = time.perf_counter()
+	try:
+		with instrumentation.Stage("job", job = job["name"]):
+			renderJob(job, **batchState)
+		return job["name"], True, "", time.perf_counter() - start
+	except Exception:
+		return job["name"], False, traceback.format_exc(), time.perf_counter() - start
+
+def runBatch(jobs: list[dict], FigurePresets: PresetStore, SubplotPresets: PresetStore, AxisPresets: PresetStore, args: argparse.Namespace) -> list[tuple[str, bool, str, float]]:
+	"""Renders many jobs at once. Every data file used by any job is parsed once up front, then the jobs are rendered by a pool of args.batch_jobs processes, 
+	each loading its data from the cache (or, with the cache disabled, sharing what was parsed through fork).
+
+	Args:
+		jobs (list[dict]): The jobs from loadJobs
+		FigurePresets (PresetStore): The figure presets
+		SubplotPresets (PresetStore): The subplot presets
+		AxisPresets (PresetStore): The axis presets
+		args (argparse.Namespace): The command line arguments
+
+	Returns:
+		list[tuple[str, bool, str, float]]: The result of each job from runJob, in the order they were given
+	"""
+	#Only the files of jobs with something to render are parsed. Jobs that name missing presets or files are left out here, and fail with a helpful error when they are rendered.
+	files = []
+	for job in jobs:
+		try:
+			figure = jobFigure(job, FigurePresets, SubplotPresets, AxisPresets)
+		except Exception:
+			continue
+		series = datasetSeries(figure["axisPresetList"], figure["datasets"])
+		_, _, frames, _ = renderPlan(**{name: value for name, value in figure.items() if name != "datasets"}, series = series, animationPath = args.animate, fps = args.fps, animationDpi = args.animate_dpi)
+		if not frames:
+			continue
+		for presets, row in zip(figure["axisPresetList"], figure["datasets"]):
+			for preset, datasets in zip(presets, row):
+				if not (preset.values["type"].value == "line" and preset.values["chunkRows"].value):
+					files += [(x.path, x.length, x.firstRow, x.columns) for x in datasets]
+	prefetchFiles(files, args.jobs)
+
+	if args.batch_jobs <= 1 or len(jobs) <= 1:
+		global batchState
+		batchState = {"FigurePresets": FigurePresets, "SubplotPresets": SubplotPresets, "AxisPresets": AxisPresets, "args": args}
+		results = []
+		for job in jobs:
+			results.append(runJob(job))
+			reportJob(*results[-1])
+		return results
+
+	context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+	with ProcessPoolExecutor(max_workers = min(args.batch_jobs, len(jobs)), mp_context = context, initializer = setBatchState, 
+			initargs = ((FigurePresets, SubplotPresets, AxisPresets), args, dataCache, buildManifest, imageWriter, mpl.rcParams.copy())) as pool:
+		futures = [pool.submit(collectRecords, runJob, job) for job in jobs]
+		for future in futures:
+			result, records = future.result()
+			instrumentation.records += records
+			reportJob(*result)
+	return [x.result()[0] for x in futures]
+
+def reportJob(name: str, succeeded: bool, error: str, seconds: float) -> None:
+	"""Prints the result of a job from runJob
+	"""
+	if succeeded:
+		print(f"Rendered {name} in {seconds:.1f}s")
+	else:
+		print(f"Failed to render {name} after {seconds:.1f}s:\n{error}")
+
+def parseArguments(args: list[str] = None) -> argparse.Namespace:
+	"""Parses the command line arguments
+
+	Args:
+		args (list[str], optional): The arguments to parse. Defaults to None, which uses sys.argv.
+
+	Returns:
+		argparse.Namespace: The parsed arguments
+	"""
+	parser = argparse.ArgumentParser(description="Graph data from .tsv, .csv, or .dat files using saved presets.")
+	parser.add_argument("--job", metavar="PATH", help="Render the figures described in a JSON or YAML job file, or every job file in a directory, without asking any questions.")
+	parser.add_argument("--batch-jobs", type=int, default=1, help="The largest number of jobs from --job to render at once, each in its own process. Defaults to 1.")
+	parser.add_argument("--no-cache", action="store_true", help="Always parse data files instead of loading them from the cache.")
+	parser.add_argument("--clear-cache", action="store_true", help="Remove every parsed data file from the cache before starting.")
+	parser.add_argument("--cache-dir", default=dataCache.directory, help=f"Where parsed data files are cached. Defaults to {dataCache.directory}.")
+	parser.add_argument("--cache-size", type=int, default=dataCache.maxBytes // 1024**2, help="The largest the cache may grow, in MiB, before the least recently used files are removed.")
+	parser.add_argument("--force", action="store_true", help="Render every picture, even those whose presets, titles, and data files haven't changed since they were last rendered.")
+	parser.add_argument("--manifest-dir", default=buildManifest.directory, help=f"Where the record of what each picture was rendered from is kept. Defaults to {buildManifest.directory}.")
+	parser.add_argument("--preset-db", default="presets.db", help="The SQLite database presets are saved to. The JSON preset files are imported into it whenever they change. Defaults to presets.db.")
+	parser.add_argument("--export-presets", action="store_true", help="Write every preset in the database back out to the JSON preset files, then exit.")
+	parser.add_argument("--encode-threads", type=int, default=imageWriter.threads, help=f"The number of threads encoding and writing pictures in the background of each process while the next frame is drawn. 0 encodes each picture before drawing the next. Defaults to {imageWriter.threads}.")
+	parser.add_argument("--no-reuse-figure", action="store_true", help="Build a new figure for every frame of a Ramachandran plot, instead of building it once and only moving the points.")
+	parser.add_argument("--animate", metavar="PATH", help=f"Save every frame of a Ramachandran plot to one animation instead of one picture per frame. {', '.join(FFMpegFormats)} files need ffmpeg, .gif, .png, and .webp files are written with Pillow.")
+	parser.add_argument("--fps", type=int, default=10, help="The frames per second of the animation. Defaults to 10.")
+	parser.add_argument("--animate-dpi", type=int, default=150, help="The resolution of each frame of the animation. Defaults to 150.")
+	parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="The least important messages shown. DEBUG shows each step as it happens. Defaults to INFO.")
+	parser.add_argument("--report", metavar="PATH", help="Record the wall time, CPU time, and peak memory of each stage (load, moving average, scale, melt, draw, savefig, and so on) of every dataset and frame, and save them to PATH as JSON, or as CSV if PATH ends in .csv.")
+	parser.add_argument("--trace-memory", action="store_true", help="With --report, also record the most memory Python allocated during each stage, and the lines that allocated the most, with tracemalloc. This slows everything down.")
+	parser.add_argument("--profile", metavar="PATH", help="Profile the main process with cProfile and save the statistics to PATH, to be read with pstats or snakeviz. Work done by other processes (-j, --batch-jobs) isn't included.")
+	parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="The largest number of processes used to load data files, or to render the frames of a Ramachandran plot, at once. Defaults to the number of CPUs.")
+	return parser.parse_args(args)
+
+def main(args: list[str] = None):
+	args = parseArguments(args)
+	logging.basicConfig(level = args.log_level, format = "%(message)s")
+	instrumentation.enabled = args.report != None
+	instrumentation.traceMemory = args.trace_memory
+	if args.trace_memory:
+		import tracemalloc
+		tracemalloc.start()
+	profiler = None
+	if args.profile != None:
+		import cProfile
+		profiler = cProfile.Profile()
+		profiler.enable()
+	try:
+		return run(args)
+	finally:
+		if profiler != None:
+			profiler.disable()
+			profiler.dump_stats(args.profile)
+			log.info("Saved the profile to %s", args.profile)
+		if args.report != None:
+			instrumentation.Write(args.report)
+			log.info("Saved the report to %s", args.report)
+
+def run(args: argparse.Namespace):
+	"""Renders the figures chosen by the user, or described by the job files, as main does once it has set up logging and instrumentation
+
+	Args:
+		args (argparse.Namespace): The parsed command line arguments
+
+	Returns:
+		int | None: 1 if any job failed, 0 if every job succeeded, None if the figure was chosen by the user
+	"""
+	dataCache.directory = args.cache_dir
+	dataCache.maxBytes = args.cache_size * 1024**2
+	dataCache.enabled = not args.no_cache
+	if args.clear_cache:
+		dataCache.Clear()
+	buildManifest.directory = args.manifest_dir
+	buildManifest.force = args.force
+	imageWriter.threads = args.encode_threads
 
-def main():
-	sns.set_theme(style="ticks")
 	figurePresetFile = "presets_figure.json"
 	subplotPresetFile = "presets_subplot.json"
 	axisPresetFile = "presets_axis.json"
-	FigurePresets = {}
-	SubplotPresets = {}
-	AxisPresets = {}
-
-	FigurePresets = loadPresets(FigurePresets, figurePresetFile, FigurePreset)
-	SubplotPresets = loadPresets(SubplotPresets, subplotPresetFile, SubplotPreset)
-	AxisPresets = loadPresets(AxisPresets, axisPresetFile, AxisPreset)
+	FigurePresets = PresetStore(args.preset_db, FigurePreset, figurePresetFile)
+	SubplotPresets = PresetStore(args.preset_db, SubplotPreset, subplotPresetFile)
+	AxisPresets = PresetStore(args.preset_db, AxisPreset, axisPresetFile)
+
+	if args.export_presets:
+		for x in [FigurePresets, SubplotPresets, AxisPresets]:
+			x.Export()
+			log.info("Exported %d preset(s) to %s", len(x), x.presetFile)
+		return 0
+
+	if args.job != None:
+		sns.set_theme(style="ticks")
+		results = runBatch(loadJobs(args.job), FigurePresets, SubplotPresets, AxisPresets, args)
+		failed = [name for name, succeeded, _, _ in results if not succeeded]
+		print(f"Rendered {len(results) - len(failed)} of {len(results)} job(s).")
+		if failed:
+			print(f"Failed: {', '.join(failed)}")
+			return 1
+		return 0
 
 	keys = greeting(FigurePresets, figurePresetFile)
-	figurePreset, _ = getPreset(FigurePresets, figurePresetFile, keys, FigurePreset)
+	figurePreset, _ = getPreset(FigurePresets, keys, FigurePreset)
 	print("\nYou have chosen the following preset:")
 	print(figurePreset.asString(True))
 
@@ -1018,8 +2805,7 @@ def main():
 	print(f"You need to select {figurePreset.values['numSubFigures'].value} subplot preset(s).")
 	for _ in range(figurePreset.values["numSubFigures"].value):
 		keys = greeting(SubplotPresets, subplotPresetFile)
-		subplotPreset, SubplotPresetsNew = getPreset(SubplotPresets, subplotPresetFile, keys, SubplotPreset)
-		SubplotPresets = copy.deepcopy(SubplotPresetsNew)
+		subplotPreset, _ = getPreset(SubplotPresets, keys, SubplotPreset)
 		print("\nYou have chosen the following preset:")
 		print(subplotPreset.asString(True))
 		subplotPresetList.append(subplotPreset)
@@ -1030,8 +2816,7 @@ def main():
 		temp = []
 		print(f"For subplot number {index + 1} of {figurePreset.values['numSubFigures'].value}, you must choose {subplotPresetList[index].values['numSubPlots'].value} plot presets.")
 		for _ in range(subplotPresetList[index].values["numSubPlots"].value):
-			axisPreset, AxisPresetsNew = getPreset(AxisPresets, axisPresetFile, keys, AxisPreset)
-			AxisPresets = copy.deepcopy(AxisPresetsNew)
+			axisPreset, _ = getPreset(AxisPresets, keys, AxisPreset)
 			print("\nYou have chosen the following preset:")
 			print(axisPreset.asString(True))
 			temp.append(axisPreset)
@@ -1039,8 +2824,9 @@ def main():
 
 	numSubplots = [len(x) for x in axisPresetList]
 	pictureName, title, subfigureTitles, subplotTitles = getVariableValues(numSubplots)
-	dataPlots = populateDatasets(axisPresetList, numSubplots, subplotTitles)
-	plotHelper(axisPresetList, subplotPresetList, figurePreset, pictureName, title, dataPlots, subfigureTitles, subplotTitles)
+	sns.set_theme(style="ticks")
+	datasets = collectDatasets(axisPresetList, numSubplots, subplotTitles)
+	plotHelper(axisPresetList, subplotPresetList, figurePreset, pictureName, title, None, subfigureTitles, subplotTitles, args.jobs, not args.no_reuse_figure, args.animate, args.fps, args.animate_dpi, datasets)
 
 if __name__=="__main__":
-	main()
\ No newline at end of file
+	sys.exit(main())
\ No newline at end of file
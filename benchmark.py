@@ -0,0 +1,437 @@
+"""Measures how long Graph.py takes to do its work
+
+Synthetic data files shaped like the ones the presets in presets_axis.json are made for are generated once,
+then each stage of Graph.py is timed on its own: reading files, moving averages, assembling subplots, each plot function, rendering whole pictures, and loading presets.
+Every measurement runs in a fresh interpreter, so nothing imported or cached by an earlier one makes a later one look faster, and the peak memory of each stage is its own.
+The results are printed as JSON, and can be saved and compared with the results of another version of Graph.py.
+Run "python benchmark.py --help" for the options.
+"""
+import argparse
+import contextlib
+import json
+import os.path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+"""The folder Graph.py is in"""
+repoDirectory = os.path.dirname(os.path.abspath(__file__))
+
+"""Commands timed by the startup benchmark, as (name, python arguments)"""
+StartupCommands = [
+	("import Graph", ["-c", "import Graph"]),
+	("Graph.py --help", [os.path.join(repoDirectory, "Graph.py"), "--help"]),
+	("import plotting libraries", ["-c", "import seaborn, matplotlib.pyplot, pandas, numpy"]),
+]
+
+"""The synthetic data files, as (name, kind, number of rows, number of frames).
+The large RMSD file has --rows rows, the others match the numRows of the RMSD_10FrAvg and R_W presets, and the Ramachandran file has a phi/psi pair for every nanosecond R_W renders."""
+DataFiles = [
+	("rmsd_small.dat", "rmsd", 1001, 1),
+	("rmsd_small.csv", "rmsd", 1001, 1),
+	("rmsd_small.tsv", "rmsd", 1001, 1),
+	("rmsd_large.dat", "rmsd", None, 1),
+	("rama.dat", "ramachandran", 1001, 391),
+]
+
+def writeDataFile(path: str, kind: str, rows: int, frames: int) -> None:
+	"""Writes a synthetic data file in the format ReadDataFile reads: a header line, then the row number followed by the values of each row
+
+	Args:
+		path (str): Where to write the file, its extension determines the separator
+		kind (str): "rmsd" for one column of values that drift slowly, "ramachandran" for a phi and psi angle per frame, clustered like real backbone angles
+		rows (int): The number of rows
+		frames (int): The number of frames of a Ramachandran file
+	"""
+	import numpy as np
+	generator = np.random.default_rng(0)
+	if kind == "rmsd":
+		values = np.abs(generator.normal(0, 0.01, (rows, 1)).cumsum(axis=0) + 2)
+		header = ["Frame", "RMSD"]
+	else:
+		#Points gather around the alpha helix and beta sheet regions, then are wrapped into -180 to 180
+		centers = np.array([[-63, -43], [-120, 130]])[generator.integers(0, 2, (rows, frames))]
+		values = ((centers + generator.normal(0, 20, (rows, frames, 2)) + 180) % 360 - 180).reshape(rows, frames * 2)
+		header = ["Res"] + [f"{angle}{x}" for x in range(frames) for angle in ["phi", "psi"]]
+
+	match os.path.splitext(path)[1]:
+		case ".csv":
+			separator, formats = ",", ["%d"] + ["%.3f"] * values.shape[1]
+		case ".tsv":
+			separator, formats = "\t", ["%d"] + ["%.3f"] * values.shape[1]
+		case _:
+			separator, formats = " ", ["%8d"] + ["%10.3f"] * values.shape[1]
+	temp = f"{path}.{os.getpid()}.tmp"
+	np.savetxt(temp, np.column_stack((np.arange(1, rows + 1), values)), fmt=formats, delimiter=separator, header=separator.join(header), comments="#")
+	os.replace(temp, path)
+
+def generateData(directory: str, rows: int) -> None:
+	"""Writes every file in DataFiles to directory, unless a file of the same name and size is already there
+
+	Args:
+		directory (str): Where to write the files
+		rows (int): The number of rows in the large RMSD file
+	"""
+	os.makedirs(directory, exist_ok=True)
+	manifestPath = os.path.join(directory, "files.json")
+	manifest = {}
+	if os.path.isfile(manifestPath):
+		with open(manifestPath) as file:
+			manifest = json.load(file)
+	for name, kind, fileRows, frames in DataFiles:
+		path = os.path.join(directory, name)
+		shape = [kind, fileRows or rows, frames]
+		if manifest.get(name) == shape and os.path.isfile(path):
+			continue
+		print(f"Generating {path}", file=sys.stderr)
+		writeDataFile(path, kind, fileRows or rows, frames)
+		manifest[name] = shape
+	with open(manifestPath, "w") as file:
+		json.dump(manifest, file)
+
+def peakMemory() -> float | None:
+	"""Returns the most memory this process has used so far, in MiB, or None if the platform can't tell
+	"""
+	try:
+		import resource
+	except ImportError:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	#Linux reports KiB, macOS reports bytes
+	return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+class Stages:
+	"""Each stage of Graph.py that can be timed. A stage sets up everything it needs, then times only the work it measures.
+	Each returns the seconds that took, along with the number of rows and frames handled, which are turned into throughput.
+	"""
+	def __init__(self, directory: str, frames: int) -> None:
+		"""
+		Args:
+			directory (str): Where the data files are, and where pictures are saved
+			frames (int): The number of Ramachandran frames rendered by the plotHelper stage
+		"""
+		import Graph
+		self.Graph = Graph
+		self.directory = directory
+		self.frames = frames
+		Graph.sns.set_theme(style="ticks")
+		Graph.dataCache.enabled = False
+		Graph.buildManifest.directory = os.path.join(directory, "manifest")
+		Graph.buildManifest.force = True
+		self.FigurePresets = Graph.loadPresets({}, os.path.join(repoDirectory, "presets_figure.json"), Graph.FigurePreset)
+		self.SubplotPresets = Graph.loadPresets({}, os.path.join(repoDirectory, "presets_subplot.json"), Graph.SubplotPreset)
+		self.AxisPresets = Graph.loadPresets({}, os.path.join(repoDirectory, "presets_axis.json"), Graph.AxisPreset)
+
+	def Path(self, name: str) -> str:
+		return os.path.join(self.directory, name)
+
+	def Preset(self, name: str, **values):
+		"""Returns a copy of an axis preset for a single dataset, with values changed
+		"""
+		preset = self.AxisPresets[name].copy(self.Graph.AxisPreset)
+		preset.values["numPlots"].value = 1
+		for key, value in values.items():
+			preset.values[key].value = value
+		return preset
+
+	def Load(self, preset, name: str):
+		"""Returns the data for a single subplot of preset showing the file name
+		"""
+		return self.Graph.populateDatasets([[preset]], [1], [[name]], 1, [[[{"name": name, "path": self.Path(name)}]]])
+
+	def Populate(self, name: str, cached: bool = False) -> dict:
+		"""Times Dataset.Populate reading a file, from the text or from the cache"""
+		if cached:
+			self.Graph.dataCache.enabled = True
+			self.Graph.dataCache.directory = self.Path("cache")
+			self.Graph.LoadDataFile(self.Path(name))
+		dataset = self.Graph.Dataset(0)
+		dataset.path = self.Path(name)
+		start = time.perf_counter()
+		dataset.Populate()
+		return {"seconds": time.perf_counter() - start, "rows": len(dataset.data)}
+
+	def MovingAverage(self, avgType: str) -> dict:
+		"""Times Dataset.CalcMovingAvg over the large file, with the window of the RMSD preset"""
+		dataset = self.Graph.Dataset(0)
+		dataset.path = self.Path("rmsd_large.dat")
+		dataset.Populate()
+		start = time.perf_counter()
+		dataset.CalcMovingAvg(self.AxisPresets["RMSD"].values["movAvgFr"].value, avgType)
+		return {"seconds": time.perf_counter() - start, "rows": len(dataset.data)}
+
+	def PopulateDatasets(self) -> dict:
+		"""Times populateDatasets assembling the large file and its moving average with the RMSD preset"""
+		preset = self.Preset("RMSD", numRows=0)
+		start = time.perf_counter()
+		dataPlots = self.Load(preset, "rmsd_large.dat")
+		return {"seconds": time.perf_counter() - start, "rows": len(dataPlots[0][0].series[0].values)}
+
+	def PlotFunction(self, function: str, preset, name: str, *args) -> dict:
+		"""Times one plot function drawing a single subplot, including drawing it to the canvas"""
+		dataPlots = self.Load(preset, name)
+		fig = self.Graph.plt.figure()
+		ax = fig.subplots()
+		start = time.perf_counter()
+		getattr(self.Graph, function)(preset, ax, name, dataPlots[0][0], *args)
+		fig.canvas.draw()
+		seconds = time.perf_counter() - start
+		self.Graph.plt.close(fig)
+		return {"seconds": seconds, "rows": sum(len(x.values) for x in dataPlots[0][0]), "frames": 1}
+
+	def PlotHelper(self, preset, name: str, frames: int) -> dict:
+		"""Times plotHelper rendering and saving every picture of a single subplot figure"""
+		dataPlots = self.Load(preset, name)
+		start = time.perf_counter()
+		self.Graph.plotHelper([[preset]], [self.SubplotPresets["One"]], self.FigurePresets["One"], self.Path(f"{preset.values['name'].value}_{self.Graph.FrameFlag}.png"),
+			name, dataPlots, [""], [[name]])
+		return {"seconds": time.perf_counter() - start, "rows": sum(len(x.values) for x in dataPlots[0][0]), "frames": frames}
+
+	def WriteLibrary(self, copies: int = 1000) -> str:
+		"""Writes a large library of axis presets, made of copies of the ones in presets_axis.json, and returns its path"""
+		with open(os.path.join(repoDirectory, "presets_axis.json")) as file:
+			presets = json.load(file)
+		path = self.Path("presets_library.json")
+		with open(path, "w") as file:
+			json.dump({f"{name} {x}": values for x in range(copies) for name, values in presets.items()}, file)
+		return path
+
+	def PresetLibrary(self) -> dict:
+		"""Times loadPresets reading a large library of axis presets, then copying every preset in it"""
+		path = self.WriteLibrary()
+		start = time.perf_counter()
+		library = self.Graph.loadPresets({}, path, self.Graph.AxisPreset)
+		for preset in library.values():
+			preset.copy(self.Graph.AxisPreset)
+		return {"seconds": time.perf_counter() - start, "rows": len(library)}
+
+	def PresetStore(self) -> dict:
+		"""Times finding the three presets a job uses in a preset database holding a large library, then saving one of them"""
+		database = self.Path("presets_library.db")
+		for x in [database, database + "-wal", database + "-shm"]:
+			if os.path.exists(x):
+				os.remove(x)
+		path = self.WriteLibrary()
+		#Importing the library happens once, not every time presets are used
+		self.Graph.PresetStore(database, self.Graph.AxisPreset, path).Connect()
+		start = time.perf_counter()
+		store = self.Graph.PresetStore(database, self.Graph.AxisPreset, path)
+		presets = [store[x] for x in ["RMSD 0", "RMSD_10FrAvg 500", "R_W 999"]]
+		store.Save(presets[0])
+		return {"seconds": time.perf_counter() - start, "rows": len(presets)}
+
+	def PictureOutput(self) -> dict:
+		"""Times PictureOutput saving pictures whose areas are just under a whole number of pixels wide, which matplotlib rounds up. 
+		Every picture must be the same size as the one savefig writes on its own.
+		"""
+		from matplotlib.transforms import Bbox
+		fig = self.Graph.plt.figure(figsize=(4, 3))
+		fig.add_subplot().plot([0, 1], [1, 0])
+		preset = self.FigurePresets["One"].copy(self.Graph.FigurePreset)
+		areas = [(72, Bbox.from_bounds(0.05383995634215544, 0.1, 3.208333333333333, 1.3)), (150, Bbox.from_bounds(0.0788306556158277, 0.1, 1.0866666666666664, 1.3)),
+			(500, Bbox.from_bounds(0.027038000752925558, 0.1, 0.4759999999999999, 1.3)), (72, Bbox.from_bounds(0, 0, 128 / 72, 1))]
+		start = time.perf_counter()
+		for index, (dpi, bbox) in enumerate(areas):
+			preset.values["dpi"].value = dpi
+			output = self.Graph.PictureOutput(preset)
+			output.bbox = bbox
+			output.Save(fig, self.Path(f"area_{index}.png"), index)
+		self.Graph.imageWriter.Wait()
+		seconds = time.perf_counter() - start
+		for index, (dpi, bbox) in enumerate(areas):
+			fig.savefig(self.Path(f"area_{index}_savefig.png"), bbox_inches=bbox, dpi=dpi)
+			size, expected = (self.Graph.plt.imread(self.Path(f"area_{index}{x}.png")).shape for x in ["", "_savefig"])
+			if size != expected:
+				raise RuntimeError(f"PictureOutput saved a {size} picture at {dpi} dpi, savefig saved a {expected} picture.")
+		self.Graph.plt.close(fig)
+		return {"seconds": seconds, "rows": 0, "frames": len(areas)}
+
+	def All(self) -> dict:
+		"""Returns every stage by name, each as a function taking no arguments"""
+		rama = lambda density: self.Preset("R_W", density=density)
+		return {
+			"Populate rmsd_small.dat": lambda: self.Populate("rmsd_small.dat"),
+			"Populate rmsd_small.csv": lambda: self.Populate("rmsd_small.csv"),
+			"Populate rmsd_small.tsv": lambda: self.Populate("rmsd_small.tsv"),
+			"Populate rmsd_large.dat": lambda: self.Populate("rmsd_large.dat"),
+			"Populate rmsd_large.dat cached": lambda: self.Populate("rmsd_large.dat", True),
+			"Populate rama.dat": lambda: self.Populate("rama.dat"),
+			"CalcMovingAvg trailing": lambda: self.MovingAverage("trailing"),
+			"CalcMovingAvg centered": lambda: self.MovingAverage("centered"),
+			"CalcMovingAvg exponential": lambda: self.MovingAverage("exponential"),
+			"populateDatasets RMSD": self.PopulateDatasets,
+			"linePlot RMSD": lambda: self.PlotFunction("linePlot", self.Preset("RMSD", numRows=0), "rmsd_large.dat"),
+			"linePlot RMSD every point": lambda: self.PlotFunction("linePlot", self.Preset("RMSD", numRows=0, downsample=0), "rmsd_large.dat"),
+			"scatterPlot": lambda: self.PlotFunction("scatterPlot", self.Preset("RMSD_10FrAvg", type="scatter", movAvg=False, color=["viridis"]), "rmsd_small.dat"),
+			"ramachandranPlot points": lambda: self.PlotFunction("ramachandranPlot", rama("points"), "rama.dat", 2),
+			"ramachandranPlot hexbin": lambda: self.PlotFunction("ramachandranPlot", rama("hexbin"), "rama.dat", 2),
+			"ramachandranPlot histogram": lambda: self.PlotFunction("ramachandranPlot", rama("histogram"), "rama.dat", 2),
+			"plotHelper RMSD_10FrAvg": lambda: self.PlotHelper(self.Preset("RMSD_10FrAvg"), "rmsd_small.dat", 1),
+			"plotHelper RMSD": lambda: self.PlotHelper(self.Preset("RMSD", numRows=0), "rmsd_large.dat", 1),
+			"plotHelper R_W": lambda: self.PlotHelper(self.Preset("R_W", endNs=2 + self.frames), "rama.dat", self.frames),
+			"loadPresets library": self.PresetLibrary,
+			"PresetStore library": self.PresetStore,
+			"PictureOutput pixel boundaries": self.PictureOutput,
+		}
+
+"""The names of every stage, in the order they run"""
+StageNames = ["Populate rmsd_small.dat", "Populate rmsd_small.csv", "Populate rmsd_small.tsv", "Populate rmsd_large.dat", "Populate rmsd_large.dat cached", "Populate rama.dat",
+	"CalcMovingAvg trailing", "CalcMovingAvg centered", "CalcMovingAvg exponential", "populateDatasets RMSD", "linePlot RMSD", "linePlot RMSD every point", "scatterPlot",
+	"ramachandranPlot points", "ramachandranPlot hexbin", "ramachandranPlot histogram", "plotHelper RMSD_10FrAvg", "plotHelper RMSD", "plotHelper R_W",
+	"loadPresets library", "PresetStore library", "PictureOutput pixel boundaries"]
+
+def runStage(name: str, directory: str, frames: int) -> dict:
+	"""Runs one stage in this process and returns its measurements. Anything it prints, and any warning, is hidden unless the BENCHMARK_VERBOSE environment variable is set.
+
+	Args:
+		name (str): The name of the stage, one of StageNames
+		directory (str): Where the data files are
+		frames (int): The number of Ramachandran frames rendered by the plotHelper stage
+
+	Returns:
+		dict: The seconds, rows, and frames the stage returned, with the peak memory before it started and after it finished, in MiB
+	"""
+	verbose = os.environ.get("BENCHMARK_VERBOSE")
+	if not verbose:
+		warnings.simplefilter("ignore")
+	with contextlib.redirect_stdout(sys.stderr if verbose else open(os.devnull, "w")):
+		stage = Stages(directory, frames).All()[name]
+		base = peakMemory()
+		result = stage()
+	result["baseMiB"] = base
+	result["peakMiB"] = peakMemory()
+	return result
+
+def timeCommand(arguments: list[str], repeat: int) -> list[float]:
+	"""Runs the python interpreter with arguments, repeat times
+
+	Args:
+		arguments (list[str]): The arguments passed to python
+		repeat (int): The number of runs
+
+	Returns:
+		list[float]: The wall time of each run in seconds
+	"""
+	times = []
+	for x in range(repeat):
+		start = time.perf_counter()
+		subprocess.run([sys.executable] + arguments, cwd=repoDirectory, stdout=subprocess.DEVNULL, check=True)
+		times.append(time.perf_counter() - start)
+	return times
+
+def benchmarkStartup(repeat: int) -> dict:
+	"""Times starting Graph.py, along with importing the plotting libraries it loads only when rendering
+
+	Args:
+		repeat (int): The number of runs of each command
+
+	Returns:
+		dict: The minimum, median, and maximum time of each command in seconds
+	"""
+	results = {}
+	for name, arguments in StartupCommands:
+		times = timeCommand(arguments, repeat)
+		results[name] = {"min": min(times), "median": statistics.median(times), "max": max(times)}
+	return results
+
+def benchmarkStages(names: list[str], directory: str, frames: int, repeat: int) -> dict:
+	"""Times each stage repeat times, each time in a fresh interpreter
+
+	Args:
+		names (list[str]): The stages to time
+		directory (str): Where the data files are
+		frames (int): The number of Ramachandran frames rendered by the plotHelper stage
+		repeat (int): The number of runs of each stage
+
+	Returns:
+		dict: For each stage, the minimum, median, and maximum seconds, the rows and frames handled per second (from the median), and the largest peak memory in MiB
+	"""
+	results = {}
+	for name in names:
+		print(f"Timing {name}", file=sys.stderr)
+		runs = []
+		for x in range(repeat):
+			output = subprocess.run([sys.executable, os.path.abspath(__file__), "--stage", name, "--data-dir", directory, "--frames", str(frames)],
+				cwd=repoDirectory, stdout=subprocess.PIPE, check=True, text=True).stdout
+			runs.append(json.loads(output.strip().splitlines()[-1]))
+		seconds = [x["seconds"] for x in runs]
+		median = statistics.median(seconds)
+		result = {"min": min(seconds), "median": median, "max": max(seconds), "rows": runs[0]["rows"], "rowsPerSecond": runs[0]["rows"] / median if median else None}
+		if "frames" in runs[0]:
+			result |= {"frames": runs[0]["frames"], "framesPerSecond": runs[0]["frames"] / median if median else None}
+		if runs[0]["peakMiB"] != None:
+			result |= {"baseMiB": max(x["baseMiB"] for x in runs), "peakMiB": max(x["peakMiB"] for x in runs)}
+		results[name] = result
+	return results
+
+def compareResults(old: dict, new: dict) -> str:
+	"""Returns a table of how much faster or slower each stage in both results got
+
+	Args:
+		old (dict): Results saved by an earlier run
+		new (dict): The results of this run
+
+	Returns:
+		str: One line per stage, with the median seconds of each run and the old time divided by the new one, above 1 if this run is faster
+	"""
+	lines = []
+	for section in ["startup", "stages"]:
+		for name in new.get(section, {}):
+			if name in old.get(section, {}):
+				before, after = old[section][name]["median"], new[section][name]["median"]
+				lines.append(f"{name:<36}{before:>10.4f}s{after:>10.4f}s{before / after if after else float('inf'):>9.2f}x")
+	return "\n".join(lines)
+
+def gitCommit() -> str | None:
+	"""Returns the commit Graph.py is at, or None if it isn't in a git repository"""
+	try:
+		return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repoDirectory, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+def parseArguments(args: list[str] = None) -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description="Times Graph.py and prints the results as JSON.")
+	parser.add_argument("-r", "--repeat", type=int, default=3, help="The number of runs of each measurement. Defaults to 3.")
+	parser.add_argument("-o", "--output", help="Also write the results to this file")
+	parser.add_argument("--compare", metavar="PATH", help="Print how each stage compares to results saved with --output by another version")
+	parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "graph_benchmark"), help="Where the synthetic data files are generated, and kept for later runs.")
+	parser.add_argument("--rows", type=int, default=1000000, help="The number of rows in the large RMSD file. Defaults to 1,000,000, the numRows of the RMSD preset.")
+	parser.add_argument("--frames", type=int, default=5, help="The number of Ramachandran frames rendered by the plotHelper R_W stage. Defaults to 5.")
+	parser.add_argument("--stages", nargs="*", metavar="STAGE", help=f"Only time these stages, and skip the startup benchmark. The stages are: {', '.join(StageNames)}.")
+	parser.add_argument("--stage", help=argparse.SUPPRESS)
+	return parser.parse_args(args)
+
+def main(args: list[str] = None) -> int:
+	args = parseArguments(args)
+	if args.stage != None:
+		#Run by benchmarkStages to time a single stage
+		sys.path.insert(0, repoDirectory)
+		print(json.dumps(runStage(args.stage, args.data_dir, args.frames)))
+		return 0
+
+	names = args.stages if args.stages != None else StageNames
+	unknown = [x for x in names if x not in StageNames]
+	if unknown:
+		print(f"Unknown stage(s): {', '.join(unknown)}", file=sys.stderr)
+		return 2
+	generateData(args.data_dir, args.rows)
+	results = {"python": sys.version.split()[0], "commit": gitCommit(), "repeat": args.repeat, "rows": args.rows, "frames": args.frames}
+	if args.stages == None:
+		results["startup"] = benchmarkStartup(args.repeat)
+	results["stages"] = benchmarkStages(names, args.data_dir, args.frames, args.repeat)
+
+	text = json.dumps(results, indent=4)
+	print(text)
+	if args.output != None:
+		with open(args.output, "w") as file:
+			file.write(text + "\n")
+	if args.compare != None:
+		with open(args.compare) as file:
+			print(compareResults(json.load(file), results), file=sys.stderr)
+	return 0
+
+if __name__=="__main__":
+	sys.exit(main())